@@ -1,30 +1,57 @@
 """P&L calculations."""
+import time
+from datetime import datetime, timedelta
 from typing import Dict, List
 
 class PnLCalculator:
+    # Trades also age out of the daily/weekly windows, so a cached result is
+    # recomputed after this long even when no trade was added.
+    PNL_CACHE_SEC = 60.0
+
     def __init__(self, data_store):
         self.store = data_store
-    
+        self._pnl_cache = None  # (trades_version, computed_at, result)
+
     def get_current_pnl(self) -> Dict:
+        """Calculate P&L for different periods; cached until the trades change."""
+        version = self.store.trades_version
+        cached = self._pnl_cache
+        if cached is not None and cached[0] == version and time.monotonic() - cached[1] < self.PNL_CACHE_SEC:
+            return cached[2]
+        result = self._compute_pnl()
+        self._pnl_cache = (version, time.monotonic(), result)
+        return result
+
+    def _compute_pnl(self) -> Dict:
         """Calculate P&L for different periods using FIFO."""
         periods = {"daily": 1, "weekly": 7, "monthly": 30}
         result = {}
-        
+
+        # One query for the widest window, parsed once; the shorter windows are
+        # its suffixes (same newest-first LIMIT, same timestamp cut-off).
+        now = datetime.now()
+        rows = [
+            (
+                trade.get("timestamp") or "",
+                (trade.get("side") or "").upper(),
+                float(trade.get("quantity") or 0),
+                float(trade.get("price") or 0),
+                float(trade.get("fee") or 0),
+            )
+            for trade in reversed(self.store.get_trades(limit=1000, days=max(periods.values())))
+        ]
+
         for period_name, days in periods.items():
-            trades = self.store.get_trades(limit=1000, days=days)
-            
+            since = (now - timedelta(days=days)).isoformat()
+            trades = [r for r in rows if r[0] > since]
+
             # Calculate P&L using FIFO
             position = 0.0
             avg_buy_price = 0.0
             total_pnl = 0.0
-            
+
             # Process trades in chronological order
-            for trade in reversed(trades):
-                side = trade.get("side", "").upper()
-                qty = float(trade.get("quantity", 0))
-                price = float(trade.get("price", 0))
-                fee = float(trade.get("fee", 0))
-                
+            for _, side, qty, price, fee in trades:
                 if side == "BUY" and qty > 0:
                     # Update average buy price
                     total_cost = (position * avg_buy_price) + (qty * price) + fee
@@ -37,19 +64,19 @@ class PnLCalculator:
                     pnl = revenue - cost
                     total_pnl += pnl
                     position -= qty
-            
+
             profit = total_pnl if total_pnl > 0 else 0
             loss = abs(total_pnl) if total_pnl < 0 else 0
-            
+
             result[period_name] = {
                 "trades": len(trades),
                 "profit": round(profit, 4),
                 "loss": round(loss, 4),
                 "net": round(total_pnl, 4)
             }
-        
+
         return result
-    
+
     def get_portfolio_value(self, balances_response: List, mewc_price: float) -> Dict:
         """Calculate portfolio value from balances."""
         try:
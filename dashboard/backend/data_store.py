@@ -2,17 +2,27 @@
 import hashlib
 import sqlite3
 import threading
+import time
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional
 
 class DataStore:
+    # Portfolio snapshots are buffered and written in one transaction once
+    # this many are pending or the last write is this old; reads flush first.
+    SNAPSHOT_BATCH_SIZE = 64
+    SNAPSHOT_FLUSH_SEC = 1.0
+
     def __init__(self, db_path: Optional[str] = None):
         if db_path is None:
             db_path = Path(__file__).parent.parent / "data.db"
         self.db_path = db_path
         self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
         self._lock = threading.Lock()
+        self._pending_snapshots: List[tuple] = []
+        self._last_snapshot_flush = 0.0
+        # Bumped whenever a trade row is inserted; lets readers cache derived data
+        self.trades_version = 0
         self._init_db()
     
     def _init_db(self):
@@ -23,6 +33,8 @@ class DataStore:
             # WAL mode: eliminuje database-is-locked przy jednoczesnym dostępie bot + dashboard
             cursor.execute("PRAGMA journal_mode=WAL")
             cursor.execute("PRAGMA synchronous=NORMAL")
+            # Większy cache stron (64 MiB) — połączenie jest trwałe, więc cache przeżywa między requestami
+            cursor.execute("PRAGMA cache_size=-65536")
 
             cursor.execute("""
             CREATE TABLE IF NOT EXISTS trades (
@@ -121,33 +133,82 @@ class DataStore:
 
         Returns True when a new row is inserted, False when deduplicated.
         """
-        ts = timestamp or datetime.now().isoformat()
-        dedupe_key = self.build_trade_key(
+        return self.add_trades([dict(
             side=side,
             quantity=quantity,
             price=price,
+            fee=fee,
             order_id=order_id,
             source_trade_id=source_trade_id,
-            timestamp=ts,
-        )
+            timestamp=timestamp,
+        )]) == 1
+    
+    def add_trades(self, trades: Iterable[Dict]) -> int:
+        """Add many trades in a single transaction.
+
+        Each item takes the add_trade() keyword fields (side, quantity, price,
+        fee, order_id, source_trade_id, timestamp). Returns the number of new
+        rows; rows whose dedupe key already exists are ignored.
+        """
+        rows = []
+        for t in trades:
+            ts = t.get("timestamp") or datetime.now().isoformat()
+            side, quantity, price = t["side"], t["quantity"], t["price"]
+            order_id, source_trade_id = t.get("order_id"), t.get("source_trade_id")
+            dedupe_key = self.build_trade_key(
+                side=side,
+                quantity=quantity,
+                price=price,
+                order_id=order_id,
+                source_trade_id=source_trade_id,
+                timestamp=ts,
+            )
+            rows.append((ts, side, quantity, price, t.get("fee", 0), order_id, source_trade_id, dedupe_key))
+        if not rows:
+            return 0
+
         with self._lock:
-            cursor = self.conn.cursor()
-            cursor.execute("""
+            before = self.conn.total_changes
+            self.conn.executemany("""
             INSERT OR IGNORE INTO trades (timestamp, side, quantity, price, fee, order_id, source_trade_id, dedupe_key)
             VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (ts, side, quantity, price, fee, order_id, source_trade_id, dedupe_key))
+            """, rows)
             self.conn.commit()
-            return cursor.rowcount == 1
-    
+            added = self.conn.total_changes - before
+            if added:
+                self.trades_version += 1
+            return added
+
     def add_snapshot(self, total_value: float):
-        """Add portfolio snapshot."""
+        """Add portfolio snapshot (buffered, see SNAPSHOT_BATCH_SIZE)."""
         with self._lock:
-            cursor = self.conn.cursor()
-            cursor.execute("""
-            INSERT INTO portfolio_snapshots (timestamp, total_value_usdt)
-            VALUES (?, ?)
-            """, (datetime.now().isoformat(), total_value))
-            self.conn.commit()
+            self._pending_snapshots.append((datetime.now().isoformat(), total_value))
+            if (len(self._pending_snapshots) >= self.SNAPSHOT_BATCH_SIZE
+                    or time.monotonic() - self._last_snapshot_flush >= self.SNAPSHOT_FLUSH_SEC):
+                self._flush_snapshots()
+
+    def flush(self):
+        """Write any buffered portfolio snapshots."""
+        with self._lock:
+            self._flush_snapshots()
+
+    def close(self):
+        """Write buffered snapshots and close the database connection."""
+        with self._lock:
+            self._flush_snapshots()
+            self.conn.close()
+
+    def _flush_snapshots(self):
+        # Caller holds self._lock
+        self._last_snapshot_flush = time.monotonic()
+        if not self._pending_snapshots:
+            return
+        self.conn.executemany("""
+        INSERT INTO portfolio_snapshots (timestamp, total_value_usdt)
+        VALUES (?, ?)
+        """, self._pending_snapshots)
+        self.conn.commit()
+        self._pending_snapshots.clear()
     
     def get_trades(self, limit: int = 100, days: int = 30) -> List[Dict]:
         """Get trades from database."""
@@ -169,6 +230,7 @@ class DataStore:
     def get_portfolio_history(self, days: int = 30) -> List[Dict]:
         """Get portfolio history."""
         with self._lock:
+            self._flush_snapshots()
             cursor = self.conn.cursor()
             since = datetime.now() - timedelta(days=days)
             cursor.execute("""
@@ -6,11 +6,40 @@ from pathlib import Path
 from .paths import find_project_file
 
 class LogParser:
+    TAIL_CHUNK = 64 * 1024
+
     def __init__(self, log_path: Optional[str] = None):
         if log_path is None:
             self.log_path = find_project_file("logs", "market_maker.log")
         else:
             self.log_path = Path(log_path)
+
+    def tail(self, lines: int) -> List[str]:
+        """Return the last `lines` lines, reading backwards from EOF in chunks."""
+        if lines <= 0:
+            return []
+        chunks = []
+        newlines = 0
+        with open(self.log_path, "rb") as f:
+            pos = f.seek(0, 2)
+            # One newline more than needed so the oldest kept line is complete
+            while pos > 0 and newlines <= lines:
+                step = min(self.TAIL_CHUNK, pos)
+                pos -= step
+                f.seek(pos)
+                chunk = f.read(step)
+                newlines += chunk.count(b"\n")
+                chunks.append(chunk)
+        text = b"".join(reversed(chunks)).decode("utf-8", errors="replace")
+        return text.splitlines()[-lines:]
+
+    def _read_lines(self, lines: int) -> List[str]:
+        """lines=0 reads the entire file, otherwise only its tail."""
+        if lines > 0:
+            return self.tail(lines)
+        with open(self.log_path, "rb") as f:
+            raw = f.read()
+        return raw.decode("utf-8", errors="replace").splitlines()
     
     def get_errors(self, lines: int = 200) -> List[str]:
         """Get error lines from logs."""
@@ -18,9 +47,8 @@ class LogParser:
             return []
         
         try:
-            with open(self.log_path, 'r') as f:
-                log_lines = f.readlines()[-lines:]
-            
+            log_lines = self.tail(lines)
+
             return [line.strip() for line in log_lines if 'ERROR' in line or 'Exception' in line][:10]
         except Exception:
             return []
@@ -39,10 +67,7 @@ class LogParser:
             return status
 
         try:
-            with open(self.log_path, "rb") as f:
-                raw = f.read()
-            all_lines = raw.decode("utf-8", errors="replace").splitlines()
-            log_lines = all_lines if lines == 0 else all_lines[-max(lines, 1):]
+            log_lines = self._read_lines(lines)
 
             active_orders: dict = {}
             prev_line = None
@@ -104,10 +129,7 @@ class LogParser:
             return []
 
         try:
-            with open(self.log_path, "rb") as f:
-                raw = f.read()
-            all_lines = raw.decode("utf-8", errors="replace").splitlines()
-            log_lines = all_lines if lines == 0 else all_lines[-max(lines, 1):]
+            log_lines = self._read_lines(lines)
 
             active_orders: dict = {}
 
@@ -153,8 +175,7 @@ class LogParser:
 
         events: List[Dict] = []
         try:
-            with open(self.log_path, 'r') as f:
-                log_lines = f.readlines()[-lines:]
+            log_lines = self.tail(lines)
 
             for line in log_lines:
                 ts_match = re.match(r'^(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})\s*\|', line)
@@ -3,6 +3,9 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Any, Dict, List
 
+_CLOSED_STATUSES = frozenset({"FILLED", "CANCELED", "CANCELLED", "REJECTED", "EXPIRED", "CLOSED"})
+_OPEN_STATUSES = frozenset({"OPEN", "NEW", "PARTIALLY_FILLED", "PARTIAL", "ACTIVE"})
+
 
 @dataclass
 class TradingService:
@@ -45,29 +48,30 @@ class TradingService:
             return []
 
         normalized = []
-        closed_statuses = {"FILLED", "CANCELED", "CANCELLED", "REJECTED", "EXPIRED", "CLOSED"}
-        open_statuses = {"OPEN", "NEW", "PARTIALLY_FILLED", "PARTIAL", "ACTIVE"}
+        sf = self._sf
 
         for order in rows:
             if not isinstance(order, dict):
                 continue
-            side = str(order.get("side") or order.get("type") or "").upper()
-            price_val = self._sf(order.get("price") or order.get("rate") or order.get("limitPrice"))
-            qty_val = self._sf(order.get("quantity") or order.get("origQty") or order.get("qty") or order.get("amount"))
             status = str(order.get("status") or order.get("state") or "OPEN").upper()
-            filled = self._sf(order.get("filled") or order.get("executedQty") or order.get("cumQty"))
+            # Closed rows are dropped before any parsing
+            if status in _CLOSED_STATUSES:
+                continue
+            qty_val = sf(order.get("quantity") or order.get("origQty") or order.get("qty") or order.get("amount"))
+            filled = sf(order.get("filled") or order.get("executedQty") or order.get("cumQty"))
 
             remaining_raw = order.get("remaining") or order.get("leavesQty") or order.get("openQty")
-            remaining = self._sf(remaining_raw, max(qty_val - filled, 0.0))
+            remaining = sf(remaining_raw, max(qty_val - filled, 0.0))
             if remaining <= 0 and qty_val > filled:
                 remaining = max(qty_val - filled, 0.0)
+            if remaining <= 0 and status not in _OPEN_STATUSES:
+                continue
 
-            oid = str(order.get("id") or order.get("orderId") or order.get("clientOrderId") or "")
             normalized.append(
                 {
-                    "id": oid,
-                    "side": side,
-                    "price": price_val,
+                    "id": str(order.get("id") or order.get("orderId") or order.get("clientOrderId") or ""),
+                    "side": str(order.get("side") or order.get("type") or "").upper(),
+                    "price": sf(order.get("price") or order.get("rate") or order.get("limitPrice")),
                     "quantity": qty_val,
                     "remaining": remaining,
                     "status": status,
@@ -75,12 +79,7 @@ class TradingService:
                 }
             )
 
-        return [
-            o
-            for o in normalized
-            if (o["status"] in open_statuses)
-            or (o["status"] not in closed_statuses and o["remaining"] > 0)
-        ]
+        return normalized
 
     def cancel_open_order(self, order_id: str) -> Dict[str, Any]:
         result = self.api_client.cancel_order(order_id)
@@ -1,5 +1,5 @@
 from fastapi import FastAPI
-from fastapi.responses import HTMLResponse, FileResponse
+from fastapi.responses import HTMLResponse, FileResponse, JSONResponse
 from fastapi.staticfiles import StaticFiles
 from pathlib import Path
 import logging
@@ -8,9 +8,14 @@ import sys
 
 import asyncio
 import requests
+from requests.adapters import HTTPAdapter
 from datetime import datetime, timedelta
 import math
 import hashlib
+import functools
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
 
 from pydantic import BaseModel, Field
 
@@ -36,9 +41,36 @@ calculator = PnLCalculator(data_store)
 log_parser = LogParser()
 trading_service = TradingService(api_client=api_client, data_store=data_store)
 
+# Keep-alive session for the public ticker polled by /api/price
+_HTTP = requests.Session()
+_HTTP.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+
 logger = logging.getLogger(__name__)
 
-app = FastAPI()
+try:
+    import orjson
+except ImportError:  # optional: stdlib json is used without it
+    orjson = None
+
+
+class DashboardJSONResponse(JSONResponse):
+    """JSONResponse encoded with orjson when available (orderbook/history/fills arrays)."""
+
+    def render(self, content) -> bytes:
+        if orjson is None:
+            return super().render(content)
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Buffered portfolio snapshots would be lost otherwise. Only flushed, not
+    # closed: the module-level store outlives any one server (or TestClient) run.
+    data_store.flush()
+
+
+app = FastAPI(default_response_class=DashboardJSONResponse, lifespan=lifespan)
 app.mount("/static", StaticFiles(directory=Path(__file__).parent / "static"), name="static")
 
 HARD_LIMITS = {
@@ -84,6 +116,60 @@ async def run_blocking(func, *args, **kwargs):
     return await asyncio.to_thread(func, *args, **kwargs)
 
 
+def ttl_cache(seconds: float, maxsize: int = 64):
+    """Cache a read-only GET handler's response per query args for `seconds`.
+
+    Concurrent misses for the same key wait on one computation instead of all
+    hitting the exchange; if a refresh raises, the last good response is served.
+    Each handler keeps at most `maxsize` entries (least recently used evicted);
+    expired entries for other args are dropped whenever a new response is stored.
+    """
+    def decorator(func):
+        cache: OrderedDict = OrderedDict()   # key -> (expires_at, response)
+        locks: dict = {}                      # key -> asyncio.Lock
+
+        def store(key, value):
+            now = time.monotonic()
+            for k in [k for k, (expires, _) in cache.items() if expires <= now and k != key]:
+                del cache[k]
+                lock = locks.get(k)
+                if lock is not None and not lock.locked():
+                    del locks[k]
+            cache[key] = (now + seconds, value)
+            cache.move_to_end(key)
+            while len(cache) > maxsize:
+                evicted, _ = cache.popitem(last=False)
+                lock = locks.get(evicted)
+                if lock is not None and not lock.locked():
+                    del locks[evicted]
+
+        @functools.wraps(func)
+        async def wrapper(**kwargs):
+            key = tuple(sorted(kwargs.items()))
+            cached = cache.get(key)
+            if cached is not None and cached[0] > time.monotonic():
+                cache.move_to_end(key)
+                return cached[1]
+            lock = locks.setdefault(key, asyncio.Lock())
+            async with lock:
+                cached = cache.get(key)
+                if cached is not None and cached[0] > time.monotonic():
+                    return cached[1]
+                try:
+                    value = await func(**kwargs)
+                except Exception as e:
+                    if cached is None:
+                        raise
+                    logger.warning("%s failed, serving stale response: %s", func.__name__, e)
+                    return cached[1]
+                store(key, value)
+                return value
+
+        wrapper.cache = cache
+        return wrapper
+    return decorator
+
+
 def percentile(vals, p):
     if not vals:
         return 0
@@ -92,6 +178,7 @@ def percentile(vals, p):
     return vv[k]
 
 
+@functools.lru_cache(maxsize=4096)
 def build_confirm_token(side: str, order_type: str, quantity: float, price: float, reduce_only: bool) -> str:
     payload = f"{side}|{order_type}|{round(quantity, 8)}|{round(price, 10)}|{int(reduce_only)}"
     return "confirm-" + hashlib.sha256(payload.encode()).hexdigest()[:12]
@@ -104,9 +191,12 @@ def manual_order_preflight(payload: dict):
     reduce_only = bool(payload.get("reduce_only", False))
 
     px = sf(payload.get("price"))
-    pd = get_price_data() or {}
-    ref_price = sf(pd.get("last_price"), 0.00003750)
-    used_price = px if order_type == "LIMIT" and px > 0 else ref_price
+    if order_type == "LIMIT" and px > 0:
+        used_price = px
+    else:
+        # Only market (or unpriced) orders need the ticker round-trip
+        pd = get_price_data() or {}
+        used_price = sf(pd.get("last_price"), 0.00003750)
 
     min_qty = 1.0
     min_notional = 1.0
@@ -248,10 +338,10 @@ def enrich_trades_with_realized_pnl(trades: list) -> list:
     return list(reversed(enriched))
 
 
-def get_price_data():
-    """Get MEWC price data."""
+def get_price_data(http: requests.Session = _HTTP):
+    """Get MEWC price data. `http` is the session used for the ticker request."""
     try:
-        r = requests.get("https://api.nonkyc.io/api/v2/ticker/MEWC_USDT", timeout=5)
+        r = http.get("https://api.nonkyc.io/api/v2/ticker/MEWC_USDT", timeout=5)
         if r.ok:
             d = r.json()
 
@@ -323,6 +413,7 @@ async def index():
     return FileResponse(Path(__file__).parent / "templates" / "index.html")
 
 @app.get("/api/price")
+@ttl_cache(5)
 async def api_price():
     data = await run_blocking(get_price_data)
     if data is None:
@@ -552,11 +643,7 @@ async def api_fills():
     log_trades = await run_blocking(parse_fills_from_logs)
     if log_trades:
         logger.info("Parsed %s trades from logs, syncing to DB", len(log_trades))
-        added = 0
-        for t in log_trades:
-            ok = await run_blocking(data_store.add_trade, t["side"], t["quantity"], t["price"], t["fee"], t["order_id"], None, t.get("timestamp"))
-            if ok:
-                added += 1
+        added = await run_blocking(data_store.add_trades, log_trades)
         if added:
             logger.info("Added %s new trades to DB from logs", added)
 
@@ -580,10 +667,10 @@ async def sync_trades():
     fills = result.get("trades", result) if isinstance(result, dict) else result
     logger.info("Got %s trades from API", len(fills))
 
-    added = 0
     existing = await run_blocking(data_store.get_trades, 10000, 365)
     existing_keys = {str(t.get("dedupe_key") or "") for t in existing}
 
+    new_trades = []
     for f in fills:
         oid = str(f.get('orderId') or '')
         tid = str(f.get('id') or '')
@@ -601,21 +688,18 @@ async def sync_trades():
         if dedupe_key in existing_keys:
             continue
 
-        inserted = await run_blocking(
-            data_store.add_trade,
-            side,
-            qty,
-            prc,
-            fee,
-            oid or dedup_id,
-            tid or None,
-            ts or None,
-        )
-        if inserted:
-            existing_keys.add(dedupe_key)
-            logger.info("Added trade %s %s @ %s", side, qty, prc)
-            added += 1
+        existing_keys.add(dedupe_key)
+        new_trades.append({
+            "side": side,
+            "quantity": qty,
+            "price": prc,
+            "fee": fee,
+            "order_id": oid or dedup_id,
+            "source_trade_id": tid or None,
+            "timestamp": ts or None,
+        })
 
+    added = await run_blocking(data_store.add_trades, new_trades)
     logger.info("Synced %s new trades", added)
     return {"status": "success", "added": added, "total": len(fills)}
 
@@ -673,6 +757,7 @@ async def api_cancel_all_orders():
 
 
 @app.get("/api/risk-cockpit")
+@ttl_cache(5)
 async def api_risk_cockpit():
     risk = await api_live_risk()
     # If risk shows zeros (API failed), try to estimate from latest portfolio snapshot
@@ -729,6 +814,7 @@ async def api_risk_cockpit():
 
 
 @app.get("/api/backtest-replay-summary")
+@ttl_cache(30)
 async def api_backtest_replay_summary():
     pnl = await get_profitability_stats()
     return {
@@ -742,6 +828,7 @@ async def api_backtest_replay_summary():
 
 
 @app.get("/api/strategy-journal")
+@ttl_cache(30)
 async def api_strategy_journal(limit: int = 30):
     log_path = find_project_file("logs", "market_maker.log")
     if not log_path.exists():
@@ -750,12 +837,11 @@ async def api_strategy_journal(limit: int = 30):
     keys = ("STRATEGY", "SIGNAL", "SKEW", "PLACE ORDER", "CANCEL ORDER", "fill", "risk")
     rows = []
     try:
-        with open(log_path, "r") as f:
-            for line in reversed(f.readlines()[-3000:]):
-                if any(k.lower() in line.lower() for k in keys):
-                    rows.append({"timestamp": line[:19], "message": line.strip()})
-                if len(rows) >= max(1, min(limit, 200)):
-                    break
+        for line in reversed(LogParser(log_path).tail(3000)):
+            if any(k.lower() in line.lower() for k in keys):
+                rows.append({"timestamp": line[:19], "message": line.strip()})
+            if len(rows) >= max(1, min(limit, 200)):
+                break
     except Exception:
         return []
 
@@ -809,6 +895,7 @@ async def api_cancel_open_order(order_id: str):
 
 
 @app.get("/api/orderbook")
+@ttl_cache(5)
 async def api_orderbook(limit: int = 20):
     """Get orderbook from exchange with fallback constructed from open orders in logs."""
     result = await run_blocking(trading_service.get_orderbook, "MEWC_USDT", limit)
@@ -835,6 +922,7 @@ async def api_close_trade(trade_id: int):
 
 
 @app.get("/api/history")
+@ttl_cache(30)
 async def api_history(days: int = 30):
     rows = data_store.get_portfolio_history(days)
     # Ogranicz do max 300 punktów przez próbkowanie równomierne
@@ -848,6 +936,7 @@ async def api_history(days: int = 30):
     return rows
 
 @app.get("/api/bot-status")
+@ttl_cache(5)
 async def api_bot_status():
     return log_parser.get_bot_status(100)
 
@@ -1160,4 +1249,5 @@ if __name__ == "__main__":
     print("✅ Ready to sync trades")
     print("🌐 http://localhost:8000")
     print("=" * 60)
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # loop/http default to uvloop + httptools when installed (uvicorn[standard])
+    uvicorn.run(app, host="0.0.0.0", port=8000, access_log=False)
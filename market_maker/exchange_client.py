@@ -5,33 +5,77 @@ Implements HMAC-SHA256 signed requests per the NonKYC API v2 specification.
 All private endpoints use the X-API-KEY, X-API-NONCE, X-API-SIGN headers.
 """
 
+import functools
 import hashlib
 import hmac
 import json
 import logging
 import re
+import threading
 import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from decimal import Decimal, ROUND_DOWN
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 
 import requests
+from urllib3.util.retry import Retry
 
 from market_maker.config import ExchangeConfig
 
+try:  # optional, faster decoder for orderbook/balance payloads
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
 logger = logging.getLogger("mewc_mm.exchange")
 
 
+@functools.lru_cache(maxsize=4096)
+def _quantize(value: float, decimals: int) -> str:
+    """Round ``value`` down to ``decimals`` places, as the exchange expects.
+
+    Memoized on (value, decimals): ladder sizes repeat every cycle and prices
+    repeat while the mid is steady. A precision change is a new key, so the
+    cache never needs clearing.
+    """
+    d = Decimal(str(value)).quantize(Decimal(10) ** -decimals, rounding=ROUND_DOWN)
+    return str(d)
+
+
 class NonKYCClient:
     """REST client for the NonKYC exchange."""
 
+    POOL_MAXSIZE = 8   # keep-alive connections held open to the API host
+    TIMEOUT = (5, 15)  # (connect, read) seconds
+
     def __init__(self, config: ExchangeConfig):
         self.base_url = config.base_url.rstrip("/")
         self.api_key = self._sanitize_credential(config.api_key)
         self.api_secret = self._sanitize_credential(config.api_secret)
         self.symbol = config.symbol
+        # One pooled keep-alive session for every REST call so each request
+        # reuses an open TLS connection instead of handshaking again.
         self.session = requests.Session()
-        self.session.headers.update({"Content-Type": "application/json"})
+        # Gateway errors are retried for idempotent requests only; urllib3's
+        # default allowed_methods excludes POST, so orders are never re-sent.
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=1, pool_maxsize=self.POOL_MAXSIZE,
+            max_retries=Retry(
+                total=2, backoff_factor=0.1, status_forcelist=(502, 503, 504),
+                raise_on_status=False,
+            ),
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({
+            "Content-Type": "application/json",
+            "Connection": "keep-alive",
+        })
+
+        # Requests may be signed from several threads at once
+        self._nonce_lock = threading.Lock()
+        self._last_nonce = 0
 
         # Market metadata cache
         self._price_decimals: Optional[int] = None
@@ -72,9 +116,16 @@ class NonKYCClient:
     # Authentication helpers
     # -------------------------------------------------------------------------
 
+    def _next_nonce(self) -> str:
+        """Millisecond nonce, strictly increasing even for concurrent requests."""
+        with self._nonce_lock:
+            nonce = max(int(time.time() * 1e3), self._last_nonce + 1)
+            self._last_nonce = nonce
+        return str(nonce)
+
     def _sign_get(self, url: str) -> Dict[str, str]:
         """Build signed headers for a GET request."""
-        nonce = str(int(time.time() * 1e3))
+        nonce = self._next_nonce()
         # Sign only the base URL without query string (NonKYC API v2 spec)
         base_url = url.split("?")[0]
         data_to_sign = f"{self.api_key}{base_url}{nonce}"
@@ -91,7 +142,7 @@ class NonKYCClient:
 
     def _sign_post(self, url: str, body_str: str) -> Dict[str, str]:
         """Build signed headers for a POST request."""
-        nonce = str(int(time.time() * 1e3))
+        nonce = self._next_nonce()
         data_to_sign = f"{self.api_key}{url}{body_str}{nonce}"
         signature = hmac.new(
             self.api_secret.encode(),
@@ -122,9 +173,8 @@ class NonKYCClient:
         if signed:
             headers = self._sign_get(full_url)
 
-        resp = self.session.get(full_url, headers=headers, timeout=15)
-        self._check_response(resp)
-        return resp.json()
+        resp = self.session.get(full_url, headers=headers, timeout=self.TIMEOUT)
+        return self._parse_response(resp)
 
     def _post(self, path: str, body: Dict, signed: bool = True) -> Any:
         """Execute a POST request."""
@@ -135,13 +185,16 @@ class NonKYCClient:
         if signed:
             headers = self._sign_post(url, body_str)
 
-        resp = self.session.post(url, data=body_str, headers=headers, timeout=15)
-        self._check_response(resp)
-        return resp.json()
+        resp = self.session.post(url, data=body_str, headers=headers, timeout=self.TIMEOUT)
+        return self._parse_response(resp)
 
     @staticmethod
-    def _check_response(resp: requests.Response) -> None:
-        """Check response and raise with a clear error message."""
+    def _parse_response(resp: requests.Response) -> Any:
+        """Check response, raise with a clear error message, return the JSON body.
+
+        The body is decoded once from the raw bytes and reused for both the
+        error check and the caller.
+        """
         try:
             resp.raise_for_status()
         except requests.HTTPError:
@@ -164,7 +217,7 @@ class NonKYCClient:
 
             # Try to extract the exchange's error message
             try:
-                data = resp.json()
+                data = json_loads(resp.content)
                 err = data.get("error", {})
                 msg = err.get("message", resp.text)
                 desc = err.get("description", "")
@@ -172,20 +225,18 @@ class NonKYCClient:
                     f"API error {resp.status_code}: {msg}"
                     + (f" — {desc}" if desc else "")
                 ) from None
-            except (ValueError, KeyError):
+            except (ValueError, KeyError, AttributeError):
                 raise RuntimeError(
                     f"API error {resp.status_code}: {resp.text[:200]}"
                 ) from None
 
         # Also check for JSON-level errors (some endpoints return 200 with error body)
-        try:
-            data = resp.json()
-            if isinstance(data, dict) and "error" in data:
-                err = data["error"]
-                msg = err.get("message", str(err)) if isinstance(err, dict) else str(err)
-                raise RuntimeError(f"Exchange error: {msg}")
-        except (ValueError, AttributeError):
-            pass
+        data = json_loads(resp.content)
+        if isinstance(data, dict) and "error" in data:
+            err = data["error"]
+            msg = err.get("message", str(err)) if isinstance(err, dict) else str(err)
+            raise RuntimeError(f"Exchange error: {msg}")
+        return data
 
     # -------------------------------------------------------------------------
     # Public endpoints
@@ -294,11 +345,23 @@ class NonKYCClient:
 
     def get_balance(self, asset: str) -> Dict:
         """Get balance for a specific asset."""
-        balances = self.get_balances()
-        for b in balances:
-            if b.get("asset", "").upper() == asset.upper():
-                return b
-        return {"asset": asset, "available": "0", "held": "0"}
+        return self.get_asset_balances(asset)[asset]
+
+    def get_asset_balances(self, *assets: str) -> Dict[str, Dict]:
+        """Get balances for several assets with a single request.
+
+        Returns {asset: balance}; assets missing from the account are
+        reported with zero available/held.
+        """
+        wanted = {a.upper(): a for a in assets}
+        found: Dict[str, Dict] = {}
+        for b in self.get_balances():
+            asset = wanted.get(b.get("asset", "").upper())
+            if asset is not None and asset not in found:
+                found[asset] = b
+        for asset in assets:
+            found.setdefault(asset, {"asset": asset, "available": "0", "held": "0"})
+        return found
 
     def get_active_orders(self, symbol: Optional[str] = None) -> List[Dict]:
         """Get all active/open orders, optionally filtered by symbol."""
@@ -351,6 +414,46 @@ class NonKYCClient:
         )
         return self._post("createorder", body)
 
+    def create_orders_batch(self, orders: List[Dict[str, Any]]) -> List[Dict]:
+        """
+        Place several limit orders in one call.
+
+        Each element of ``orders`` holds create_order() keyword arguments
+        (side, quantity, price, ...). Returns one entry per input order, in
+        the same order: the exchange's order object, or ``{"error": str}``
+        if that order failed. A failure never aborts the rest of the batch.
+
+        NonKYC has no bulk order-creation endpoint, so the orders are sent
+        concurrently over the pooled session.
+        """
+        return self._fan_out(lambda order: self.create_order(**order), orders)
+
+    def cancel_orders_batch(self, order_ids: List[str]) -> List[Dict]:
+        """
+        Cancel several orders by ID; per-order errors are returned as ``{"error": str}``.
+
+        NonKYC only cancels by ID one order per request, so the requests are
+        fanned out over the session's connection pool and results come back
+        in input order.
+        """
+        return self._fan_out(self.cancel_order, order_ids)
+
+    def _fan_out(self, func: Callable[[Any], Dict], items: List[Any]) -> List[Dict]:
+        """Run ``func`` over ``items`` on up to POOL_MAXSIZE threads.
+
+        Results keep input order; an exception becomes ``{"error": str}``.
+        """
+        def call(item: Any) -> Dict:
+            try:
+                return func(item)
+            except Exception as e:
+                return {"error": str(e)}
+
+        if len(items) <= 1:
+            return [call(item) for item in items]
+        with ThreadPoolExecutor(max_workers=min(self.POOL_MAXSIZE, len(items))) as ex:
+            return list(ex.map(call, items))
+
     def cancel_order(self, order_id: str) -> Dict:
         """Cancel an open order by its exchange-assigned ID."""
         logger.info("CANCEL ORDER  id=%s", order_id)
@@ -394,14 +497,8 @@ class NonKYCClient:
 
     def format_price(self, price: float) -> str:
         """Round and format a price to the exchange's required decimal places."""
-        d = Decimal(str(price)).quantize(
-            Decimal(10) ** -self.price_decimals, rounding=ROUND_DOWN
-        )
-        return str(d)
+        return _quantize(price, self.price_decimals)
 
     def format_quantity(self, qty: float) -> str:
         """Round and format a quantity to the exchange's required decimal places."""
-        d = Decimal(str(qty)).quantize(
-            Decimal(10) ** -self.quantity_decimals, rounding=ROUND_DOWN
-        )
-        return str(d)
+        return _quantize(qty, self.quantity_decimals)
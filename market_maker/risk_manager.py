@@ -5,43 +5,166 @@ Enforces position limits, daily loss limits, and inventory skew adjustments
 to keep the bot operating within predefined safety bounds.
 """
 
+import array
+import itertools
 import logging
+import threading
 import time
-from dataclasses import dataclass, field
-from typing import Dict, Optional
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
 
 from market_maker.config import RiskConfig
 
 logger = logging.getLogger("mewc_mm.risk")
 
 
-@dataclass
+def _compute_skew(total_mewc: float, total_usdt: float, mid: float,
+                  target: float, denom: float, factor: float) -> float:
+    """Scalar inventory-skew kernel behind RiskManager.compute_inventory_skew.
+
+    Kept free of attribute access so it can be called (or compiled) in
+    isolation: total holdings in, clamped and scaled skew out.
+    """
+    if mid <= 0.0:
+        return 0.0
+    mewc_value_usdt = total_mewc * mid
+    total_portfolio = mewc_value_usdt + total_usdt
+    if total_portfolio <= 0.0:
+        return 0.0
+    # Ratio of MEWC value in total portfolio (0 to 1), relative to the target
+    skew = (mewc_value_usdt / total_portfolio - target) / denom
+    if skew > 1.0:
+        skew = 1.0
+    elif skew < -1.0:
+        skew = -1.0
+    return skew * factor
+
+
+# Field layout of PositionState's float64 buffer
+(MEWC_BALANCE, USDT_BALANCE, MEWC_HELD, USDT_HELD, INITIAL_MEWC, INITIAL_USDT,
+ DAILY_PNL_USDT, DAY_START_TS, LAST_MID_PRICE) = range(9)
+
+_POSITION_FIELDS = (
+    "mewc_balance", "usdt_balance",
+    "mewc_held", "usdt_held",          # Locked in open orders
+    "initial_mewc", "initial_usdt",
+    "daily_pnl_usdt", "day_start_ts", "last_mid_price",
+)
+
+
+def _buffer_field(index: int) -> property:
+    def fget(self) -> float:
+        return self._a[index]
+
+    def fset(self, value: float) -> None:
+        self._a[index] = value
+
+    return property(fget, fset)
+
+
 class PositionState:
-    """Tracks current inventory and P&L."""
-    mewc_balance: float = 0.0
-    usdt_balance: float = 0.0
-    mewc_held: float = 0.0       # Locked in open orders
-    usdt_held: float = 0.0       # Locked in open orders
-    initial_mewc: float = 0.0
-    initial_usdt: float = 0.0
-    daily_pnl_usdt: float = 0.0
-    day_start_ts: float = field(default_factory=time.time)
-    last_mid_price: float = 0.0
+    """Tracks current inventory and P&L.
+
+    All fields live in one contiguous float64 buffer (indices above), so
+    consumers can read the whole state without copying via buffer() or
+    as_numpy().
+    """
+
+    __slots__ = ("_a",)
+
+    mewc_balance = _buffer_field(MEWC_BALANCE)
+    usdt_balance = _buffer_field(USDT_BALANCE)
+    mewc_held = _buffer_field(MEWC_HELD)
+    usdt_held = _buffer_field(USDT_HELD)
+    initial_mewc = _buffer_field(INITIAL_MEWC)
+    initial_usdt = _buffer_field(INITIAL_USDT)
+    daily_pnl_usdt = _buffer_field(DAILY_PNL_USDT)
+    day_start_ts = _buffer_field(DAY_START_TS)
+    last_mid_price = _buffer_field(LAST_MID_PRICE)
+
+    def __init__(self, mewc_balance: float = 0.0, usdt_balance: float = 0.0,
+                 mewc_held: float = 0.0, usdt_held: float = 0.0,
+                 initial_mewc: float = 0.0, initial_usdt: float = 0.0,
+                 daily_pnl_usdt: float = 0.0, day_start_ts: Optional[float] = None,
+                 last_mid_price: float = 0.0):
+        self._a = array.array("d", (
+            mewc_balance, usdt_balance, mewc_held, usdt_held,
+            initial_mewc, initial_usdt, daily_pnl_usdt,
+            time.time() if day_start_ts is None else day_start_ts,
+            last_mid_price,
+        ))
+
+    def buffer(self) -> memoryview:
+        """Zero-copy view of the underlying float64 buffer."""
+        return memoryview(self._a)
+
+    def as_numpy(self):
+        """Zero-copy NumPy view of the state (requires numpy)."""
+        import numpy as np
+        return np.frombuffer(self._a, dtype=np.float64)
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={value!r}" for name, value in zip(_POSITION_FIELDS, self._a))
+        return f"PositionState({fields})"
+
+
+class RiskSnapshot(NamedTuple):
+    """Read-only view of the risk state, taken once per cycle."""
+    mewc_balance: float
+    usdt_balance: float
+    mewc_held: float
+    usdt_held: float
+    daily_pnl_usdt: float
+    inventory_ratio: float
+    skew: float
+    buy_budget: float
+    sell_inventory: float
 
 
 class RiskManager:
     """Enforces risk limits and calculates inventory-adjusted quotes."""
 
+    __slots__ = (
+        "cfg", "position",
+        "_accepting_orders", "_halt_reason", "_loss_streak",
+        "_open_orders",
+        # Config-derived caches
+        "_max_open_orders", "_max_consecutive_losses", "_max_balance_usage_pct", "_buy_budget", "_sell_inventory",
+        "_skew_t", "_skew_denom",
+        # In-flight exposure reservations
+        "_res_lock", "_res_ids", "_reservations", "_usdt_reserved", "_mewc_reserved",
+    )
+
     def __init__(self, config: RiskConfig):
         self.cfg = config
         self.position = PositionState()
-        self._halted = False
+        # Flipped only by halt()/resume(); every pre-order check short-circuits on it.
+        self._accepting_orders = True
         self._halt_reason = ""
-        self._recent_realized_pnls = []
+        self._loss_streak = 0   # consecutive losing realized fills at the tail
+        self._max_consecutive_losses = max(int(getattr(config, "intraday_max_consecutive_losses", 4)), 2)
+        # Open-order count, maintained via on_order_placed()/on_order_cancelled()
+        self._open_orders = 0
+        self._max_open_orders = self.cfg.max_open_orders
+        # Spendable balances, recomputed only when balances change
+        self._max_balance_usage_pct = self.cfg.max_balance_usage_pct
+        self._buy_budget = 0.0
+        self._sell_inventory = 0.0
+        # Inventory skew constants (config is static for the manager's lifetime)
+        target = self.cfg.inventory_target_ratio
+        self._skew_t = 0.0 if target < 0.0 else (1.0 if target > 1.0 else target)
+        # Normalize by the furthest possible distance to keep range roughly [-1, 1]
+        self._skew_denom = max(self._skew_t, 1.0 - self._skew_t, 1e-9)
+        # Exposure reserved by orders in flight (placed but not yet reflected
+        # in exchange "held" balances). Guarded by _res_lock.
+        self._res_lock = threading.Lock()
+        self._res_ids = itertools.count(1)
+        self._reservations: Dict[int, Tuple[str, float]] = {}
+        self._usdt_reserved: float = 0.0
+        self._mewc_reserved: float = 0.0
 
     @property
     def is_halted(self) -> bool:
-        return self._halted
+        return not self._accepting_orders
 
     @property
     def halt_reason(self) -> str:
@@ -49,13 +172,17 @@ class RiskManager:
 
     def halt(self, reason: str) -> None:
         """Halt the bot with a reason."""
-        self._halted = True
+        self._accepting_orders = False
         self._halt_reason = reason
         logger.critical("RISK HALT: %s", reason)
 
+    def halt_fmt(self, fmt: str, *args) -> None:
+        """Halt with a %-style reason; the message is only built when halting."""
+        self.halt(fmt % args if args else fmt)
+
     def resume(self) -> None:
         """Resume after a halt (manual intervention)."""
-        self._halted = False
+        self._accepting_orders = True
         self._halt_reason = ""
         logger.info("RISK RESUMED — bot is back online")
 
@@ -67,63 +194,65 @@ class RiskManager:
                         usdt_available: float, usdt_held: float,
                         mid_price: float) -> None:
         """Update position state from exchange balance data."""
-        self.position.mewc_balance = mewc_available
-        self.position.mewc_held = mewc_held
-        self.position.usdt_balance = usdt_available
-        self.position.usdt_held = usdt_held
-        self.position.last_mid_price = mid_price
+        p = self.position
+        p.mewc_balance = mewc_available
+        p.mewc_held = mewc_held
+        p.usdt_balance = usdt_available
+        p.usdt_held = usdt_held
+        p.last_mid_price = mid_price
+        self._buy_budget = usdt_available * self._max_balance_usage_pct
+        self._sell_inventory = mewc_available * self._max_balance_usage_pct
 
         # Zainicjuj initial balances przy pierwszym wywołaniu
-        if self.position.initial_mewc == 0.0 and self.position.initial_usdt == 0.0:
-            self.position.initial_mewc = mewc_available + mewc_held
-            self.position.initial_usdt = usdt_available + usdt_held
+        if p.initial_mewc == 0.0 and p.initial_usdt == 0.0:
+            p.initial_mewc = mewc_available + mewc_held
+            p.initial_usdt = usdt_available + usdt_held
             logger.info(
                 "Initial balances set — MEWC: %.2f  USDT: %.4f",
-                self.position.initial_mewc, self.position.initial_usdt,
+                p.initial_mewc, p.initial_usdt,
             )
 
         # Reset daily tracking at midnight-ish (every 24h)
-        if time.time() - self.position.day_start_ts > 86400:
-            logger.info("Daily P&L reset. Previous: %.4f USDT", self.position.daily_pnl_usdt)
-            self.position.daily_pnl_usdt = 0.0
-            self.position.day_start_ts = time.time()
-            self.position.initial_mewc = mewc_available + mewc_held
-            self.position.initial_usdt = usdt_available + usdt_held
+        now = time.time()
+        if now - p.day_start_ts > 86400:
+            logger.info("Daily P&L reset. Previous: %.4f USDT", p.daily_pnl_usdt)
+            p.daily_pnl_usdt = 0.0
+            p.day_start_ts = now
+            p.initial_mewc = mewc_available + mewc_held
+            p.initial_usdt = usdt_available + usdt_held
 
     def record_fill(self, side: str, quantity: float, price: float, fee: float = 0.0) -> None:
         """Record a trade fill to track P&L."""
-        if side == "buy":
-            cost = quantity * price + fee
-            self.position.daily_pnl_usdt -= cost
-        else:
-            revenue = quantity * price - fee
-            self.position.daily_pnl_usdt += revenue
+        # Buys spend the notional, sells earn it; the fee is always a cost.
+        p = self.position
+        sign = -1.0 if side == "buy" else 1.0
+        p.daily_pnl_usdt += sign * quantity * price - fee
 
-        logger.info(
-            "FILL RECORDED side=%s qty=%.4f price=%.8f fee=%.6f daily_pnl=%.4f",
-            side, quantity, price, fee, self.position.daily_pnl_usdt,
-        )
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "FILL RECORDED side=%s qty=%.4f price=%.8f fee=%.6f daily_pnl=%.4f",
+                side, quantity, price, fee, p.daily_pnl_usdt,
+            )
         self._check_daily_loss()
 
     def register_realized_pnl(self, pnl_usdt: float) -> None:
         """Track realized PnL stream for intraday kill-switch logic."""
-        self._recent_realized_pnls.append(float(pnl_usdt))
-        if len(self._recent_realized_pnls) > 50:
-            self._recent_realized_pnls = self._recent_realized_pnls[-50:]
+        pnl = float(pnl_usdt)
+        self._loss_streak = self._loss_streak + 1 if pnl < 0 else 0
 
         # Kill-switch: configurable consecutive losing realized sells.
-        n = max(int(getattr(self.cfg, "intraday_max_consecutive_losses", 4)), 2)
-        tail = self._recent_realized_pnls[-n:]
-        if len(tail) == n and all(p < 0 for p in tail):
-            self.halt(f"Intraday kill-switch: {n} consecutive losing fills")
+        n = self._max_consecutive_losses
+        if self._loss_streak >= n:
+            self.halt_fmt("Intraday kill-switch: %d consecutive losing fills", n)
 
     def get_inventory_ratio(self) -> float:
         """Current MEWC value ratio in total portfolio (0..1)."""
-        mid = self.position.last_mid_price
+        p = self.position
+        mid = p.last_mid_price
         if mid <= 0:
             return 0.0
-        mewc_value_usdt = (self.position.mewc_balance + self.position.mewc_held) * mid
-        total_usdt = self.position.usdt_balance + self.position.usdt_held
+        mewc_value_usdt = (p.mewc_balance + p.mewc_held) * mid
+        total_usdt = p.usdt_balance + p.usdt_held
         total_portfolio = mewc_value_usdt + total_usdt
         if total_portfolio <= 0:
             return 0.0
@@ -133,57 +262,163 @@ class RiskManager:
     # Pre-order checks
     # -------------------------------------------------------------------------
 
-    def check_can_place_orders(self, num_new_orders: int, existing_orders: int) -> bool:
-        """Check whether we're within order-count limits."""
-        if self._halted:
+    def on_order_placed(self, count: int = 1) -> None:
+        """Register orders that were accepted by the exchange."""
+        self._open_orders += count
+
+    def on_order_cancelled(self, count: int = 1) -> None:
+        """Register orders that left the book (cancelled or filled)."""
+        self._open_orders = max(self._open_orders - count, 0)
+
+    @property
+    def open_orders(self) -> int:
+        return self._open_orders
+
+    def can_place(self, num_new_orders: int) -> bool:
+        """Check whether num_new_orders more orders fit within order-count limits."""
+        if not self._accepting_orders:
             logger.warning("Order blocked — bot is halted: %s", self._halt_reason)
             return False
 
-        total = existing_orders + num_new_orders
-        if total > self.cfg.max_open_orders:
+        total = self._open_orders + num_new_orders
+        if total > self._max_open_orders:
             logger.warning(
                 "Order limit: %d existing + %d new = %d > max %d",
-                existing_orders, num_new_orders, total, self.cfg.max_open_orders,
+                self._open_orders, num_new_orders, total, self._max_open_orders,
             )
             return False
         return True
 
+    def check_can_place_orders(self, num_new_orders: int, existing_orders: int = 0) -> bool:
+        """Deprecated alias of can_place().
+
+        The open-order count is now tracked by the manager itself, so
+        ``existing_orders`` is ignored.
+        """
+        return self.can_place(num_new_orders)
+
     def check_exposure(self, side: str, quantity: float, price: float) -> bool:
         """Check whether a proposed order would exceed exposure limits."""
-        if self._halted:
+        if not self._accepting_orders:
             return False
 
+        p = self.position
+        cfg = self.cfg
         if side == "buy":
             # Check USDT exposure
             additional_usdt = quantity * price
-            total_usdt = self.position.usdt_held + additional_usdt
-            if total_usdt > self.cfg.max_usdt_exposure:
+            total_usdt = p.usdt_held + additional_usdt
+            if total_usdt > cfg.max_usdt_exposure:
                 logger.warning(
                     "USDT exposure limit: held=%.2f + new=%.2f = %.2f > max=%.2f",
-                    self.position.usdt_held, additional_usdt, total_usdt,
-                    self.cfg.max_usdt_exposure,
+                    p.usdt_held, additional_usdt, total_usdt,
+                    cfg.max_usdt_exposure,
                 )
                 return False
         else:
             # Check MEWC exposure
-            total_mewc = self.position.mewc_held + quantity
-            if total_mewc > self.cfg.max_mewc_exposure:
+            total_mewc = p.mewc_held + quantity
+            if total_mewc > cfg.max_mewc_exposure:
                 logger.warning(
                     "MEWC exposure limit: held=%.2f + new=%.2f = %.2f > max=%.2f",
-                    self.position.mewc_held, quantity, total_mewc,
-                    self.cfg.max_mewc_exposure,
+                    p.mewc_held, quantity, total_mewc,
+                    cfg.max_mewc_exposure,
                 )
                 return False
 
         return True
 
+    def check_exposure_batch(self, orders: Sequence[Tuple[str, float, float]]) -> List[bool]:
+        """Check a whole quote ladder against aggregate exposure headroom.
+
+        ``orders`` is a sequence of ``(side, quantity, price)`` tuples in
+        placement order. Each side's running total is checked, so once the
+        headroom is used up every later order on that side is rejected.
+        Returns one admissibility flag per order.
+        """
+        if not self._accepting_orders:
+            return [False] * len(orders)
+
+        usdt_left = self.cfg.max_usdt_exposure - self.position.usdt_held
+        mewc_left = self.cfg.max_mewc_exposure - self.position.mewc_held
+        usdt_cum = 0.0
+        mewc_cum = 0.0
+        mask: List[bool] = []
+        for side, quantity, price in orders:
+            if side == "buy":
+                usdt_cum += quantity * price
+                mask.append(usdt_cum <= usdt_left)
+            else:
+                mewc_cum += quantity
+                mask.append(mewc_cum <= mewc_left)
+
+        if not all(mask):
+            logger.warning(
+                "Exposure limit: %d / %d ladder orders admitted "
+                "(USDT new=%.2f headroom=%.2f | MEWC new=%.2f headroom=%.2f)",
+                sum(mask), len(mask), usdt_cum, usdt_left, mewc_cum, mewc_left,
+            )
+        return mask
+
+    def reserve_exposure(self, side: str, quantity: float, price: float) -> Optional[int]:
+        """Atomically check headroom and reserve exposure for an order.
+
+        Returns a reservation token, or None if the order would breach the
+        exposure limits. Release the token with release_exposure() once the
+        order has been cancelled or filled.
+        """
+        if not self._accepting_orders:
+            return None
+
+        with self._res_lock:
+            if side == "buy":
+                amount = quantity * price
+                total_usdt = self.position.usdt_held + self._usdt_reserved + amount
+                if total_usdt > self.cfg.max_usdt_exposure:
+                    logger.warning(
+                        "USDT exposure limit: held=%.2f + reserved=%.2f + new=%.2f > max=%.2f",
+                        self.position.usdt_held, self._usdt_reserved, amount,
+                        self.cfg.max_usdt_exposure,
+                    )
+                    return None
+                self._usdt_reserved += amount
+            else:
+                amount = quantity
+                total_mewc = self.position.mewc_held + self._mewc_reserved + amount
+                if total_mewc > self.cfg.max_mewc_exposure:
+                    logger.warning(
+                        "MEWC exposure limit: held=%.2f + reserved=%.2f + new=%.2f > max=%.2f",
+                        self.position.mewc_held, self._mewc_reserved, amount,
+                        self.cfg.max_mewc_exposure,
+                    )
+                    return None
+                self._mewc_reserved += amount
+
+            token = next(self._res_ids)
+            self._reservations[token] = (side, amount)
+            return token
+
+    def release_exposure(self, token: Optional[int]) -> None:
+        """Release a reservation made by reserve_exposure(). Unknown tokens are ignored."""
+        if token is None:
+            return
+        with self._res_lock:
+            entry = self._reservations.pop(token, None)
+            if entry is None:
+                return
+            side, amount = entry
+            if side == "buy":
+                self._usdt_reserved = max(self._usdt_reserved - amount, 0.0)
+            else:
+                self._mewc_reserved = max(self._mewc_reserved - amount, 0.0)
+
     def get_available_buy_budget(self) -> float:
         """Max USDT available for buy orders."""
-        return self.position.usdt_balance * self.cfg.max_balance_usage_pct
+        return self._buy_budget
 
     def get_available_sell_inventory(self) -> float:
         """Max MEWC available for sell orders."""
-        return self.position.mewc_balance * self.cfg.max_balance_usage_pct
+        return self._sell_inventory
 
     # -------------------------------------------------------------------------
     # Inventory skew
@@ -200,61 +435,76 @@ class RiskManager:
         The idea: if inventory is heavy on one side, we incentivise fills on
         the other side to rebalance.
         """
-        if self.cfg.inventory_skew_factor == 0:
-            return 0.0
-
-        total_mewc = self.position.mewc_balance + self.position.mewc_held
-        mid = self.position.last_mid_price
-
-        if mid <= 0:
+        factor = self.cfg.inventory_skew_factor
+        if factor == 0:
             return 0.0
+        p = self.position
+        return _compute_skew(
+            p.mewc_balance + p.mewc_held,
+            p.usdt_balance + p.usdt_held,
+            p.last_mid_price,
+            self._skew_t,
+            self._skew_denom,
+            factor,
+        )
 
-        mewc_value_usdt = total_mewc * mid
-        total_usdt = self.position.usdt_balance + self.position.usdt_held
-        total_portfolio = mewc_value_usdt + total_usdt
-
-        if total_portfolio <= 0:
-            return 0.0
+    def snapshot(self) -> RiskSnapshot:
+        """Consistent copy of balances, inventory ratio, skew and budgets.
 
-        # Ratio of MEWC value in total portfolio (0 to 1)
-        mewc_ratio = mewc_value_usdt / total_portfolio
-        # Neutral is configurable via inventory_target_ratio
-        target = min(max(self.cfg.inventory_target_ratio, 0.0), 1.0)
-        # Normalize by the furthest possible distance to keep range roughly [-1, 1]
-        denom = max(target, 1.0 - target, 1e-9)
-        skew = (mewc_ratio - target) / denom
-        skew = max(min(skew, 1.0), -1.0)
-        return skew * self.cfg.inventory_skew_factor
+        Reads the position buffer once; callers use the snapshot for the
+        rest of the cycle instead of going back to the manager per value.
+        """
+        (mewc, usdt, mewc_held, usdt_held, _, _,
+         daily_pnl, _, mid) = self.position.buffer()
+        total_mewc = mewc + mewc_held
+        total_usdt = usdt + usdt_held
+        ratio = 0.0
+        if mid > 0:
+            mewc_value = total_mewc * mid
+            if mewc_value + total_usdt > 0:
+                ratio = mewc_value / (mewc_value + total_usdt)
+        factor = self.cfg.inventory_skew_factor
+        skew = 0.0 if factor == 0 else _compute_skew(
+            total_mewc, total_usdt, mid, self._skew_t, self._skew_denom, factor,
+        )
+        return RiskSnapshot(
+            mewc, usdt, mewc_held, usdt_held, daily_pnl, ratio, skew,
+            self._buy_budget, self._sell_inventory,
+        )
 
     # -------------------------------------------------------------------------
     # Internal checks
     # -------------------------------------------------------------------------
 
-    def _check_daily_loss(self) -> None:
-        """Halt if daily loss limit is breached."""
-        if self.position.daily_pnl_usdt < self.cfg.daily_loss_limit_usdt:
-            self.halt(
-                f"Daily loss limit breached: {self.position.daily_pnl_usdt:.2f} USDT "
-                f"< {self.cfg.daily_loss_limit_usdt:.2f} USDT"
+    def _check_daily_loss(self) -> bool:
+        """Halt if daily loss limit is breached. Returns True if halted."""
+        daily_pnl = self.position.daily_pnl_usdt
+        if daily_pnl < self.cfg.daily_loss_limit_usdt:
+            self.halt_fmt(
+                "Daily loss limit breached: %.2f USDT < %.2f USDT",
+                daily_pnl, self.cfg.daily_loss_limit_usdt,
             )
+            return True
+        return False
 
-    def _check_stop_loss(self) -> None:
-        """Check unrealized P&L stop-loss."""
-        mid = self.position.last_mid_price
-        if mid <= 0:
+    def periodic_check(self) -> None:
+        """Run periodic risk checks (call from main loop).
+
+        Daily-loss and stop-loss are evaluated in a single pass over the
+        position; at most one halt is raised per call.
+        """
+        if self._check_daily_loss():
             return
 
-        total_mewc = self.position.mewc_balance + self.position.mewc_held
-        unrealized = (total_mewc - self.position.initial_mewc) * mid
-        unrealized += (self.position.usdt_balance + self.position.usdt_held) - self.position.initial_usdt
+        p = self.position
+        mid = p.last_mid_price
+        if mid <= 0:
+            return
 
+        unrealized = (p.mewc_balance + p.mewc_held - p.initial_mewc) * mid
+        unrealized += (p.usdt_balance + p.usdt_held) - p.initial_usdt
         if unrealized < self.cfg.stop_loss_usdt:
-            self.halt(
-                f"Stop-loss triggered: unrealized P&L {unrealized:.2f} USDT "
-                f"< {self.cfg.stop_loss_usdt:.2f} USDT"
+            self.halt_fmt(
+                "Stop-loss triggered: unrealized P&L %.2f USDT < %.2f USDT",
+                unrealized, self.cfg.stop_loss_usdt,
             )
-
-    def periodic_check(self) -> None:
-        """Run periodic risk checks (call from main loop)."""
-        self._check_daily_loss()
-        self._check_stop_loss()
@@ -8,18 +8,30 @@ Implements a symmetric spread-based market maker with:
 """
 
 import logging
+import queue
+import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from market_maker.config import StrategyConfig, BotConfig
 from market_maker.exchange_client import NonKYCClient
 from market_maker.risk_manager import RiskManager
+from market_maker.ws_client import NonKYCUserStream, NonKYCWebSocketClient, OrderReport
 
 logger = logging.getLogger("mewc_mm.strategy")
 
+# Exchange order states (upper-cased) seen by the fill check
+_FILL_STATES = frozenset(("FILLED", "PARTIALLY_FILLED"))
+# States after which an order is off the book
+_DONE_STATES = frozenset(("FILLED", "CANCELED", "CANCELLED", "EXPIRED", "REJECTED"))
+# States that keep an order tracked even when the open-orders list misses it
+_OPEN_STATES = frozenset(("NEW", "OPEN", "ACTIVE", "PENDING"))
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class QuoteLevel:
     """A single price/quantity level to be placed on the book."""
     side: str          # "buy" or "sell"
@@ -28,25 +40,68 @@ class QuoteLevel:
     level: int         # 0 = closest to mid
 
 
+@dataclass(slots=True)
+class ActiveOrder:
+    """A bot order resting on the book."""
+    quote: QuoteLevel
+    reservation: Optional[int]   # RiskManager exposure token, until balances reflect it
+    filled: float = 0.0          # quantity already recorded to RiskManager
+
+
 class MarketMaker:
     """
     Core market-making engine.
 
     On each refresh cycle:
       1. Fetch current orderbook mid-price
-      2. Cancel all existing bot orders
-      3. Compute new bid/ask quotes with inventory skew
-      4. Place new orders respecting risk limits
+      2. Compute new bid/ask quotes with inventory skew
+      3. Cancel bot orders that no longer match a quote
+      4. Place the missing orders respecting risk limits
     """
 
+    BOOK_MAX_AGE_SEC = 30.0   # streamed book older than this falls back to REST
+    QTY_REPRICE_TOLERANCE = 0.05   # relative size change a resting order may lag by
+    MIN_WAKE_INTERVAL_SEC = 1.0    # minimum spacing of book-triggered cycles
+    RECENTLY_CLOSED_SEC = 60.0     # how long cancelled orders still accept stream fills
+
     def __init__(self, config: BotConfig, client: NonKYCClient, risk: RiskManager):
         self.cfg = config.strategy
         self.exchange_cfg = config.exchange
         self.client = client
         self.risk = risk
-        self._active_order_ids: List[str] = []
+        self._active_orders: Dict[str, ActiveOrder] = {}   # exchange order id -> order
         self._running = False
         self._cycle_count = 0
+        # Event-driven refresh: the orderbook stream wakes the loop early when
+        # the book top moves more than queue_reprice_threshold_pct.
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._ws: Optional[NonKYCWebSocketClient] = None
+        # Fills arrive as execution reports while the user-data stream is live;
+        # _user_session is the stream session the REST fill state is synced to.
+        self._user_ws: Optional[NonKYCUserStream] = None
+        self._user_session = 0
+        # Orders we cancelled: order id -> (side, time untracked). A fill that
+        # raced the cancel is still reported on the stream and recorded.
+        self._recently_closed: "OrderedDict[str, tuple]" = OrderedDict()
+        self._last_quote_mid = 0.0
+        # Independent per-cycle REST fetches run side by side on this pool
+        self._io_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="mm-io")
+        # Config values read on hot paths, resolved once
+        self._reprice_threshold = self.cfg.queue_reprice_threshold_pct
+        self._fee_rate = float(getattr(self.exchange_cfg, "fee_maker_pct", 0.002))
+        self._build_ladder()
+
+    def _build_ladder(self) -> None:
+        """Precompute the config-only parts of the quote ladder.
+
+        Call again if the strategy config is changed on a live instance.
+        """
+        cfg = self.cfg
+        self._effective_spread = max(cfg.spread_pct, cfg.min_spread_pct)
+        levels = range(cfg.num_levels)
+        self._level_offsets = [self._effective_spread + level * cfg.level_step_pct for level in levels]
+        self._level_qtys = [cfg.base_quantity * (cfg.quantity_multiplier ** level) for level in levels]
 
     # -------------------------------------------------------------------------
     # Execution quality snapshot (RiskManager compatible)
@@ -57,20 +112,14 @@ class MarketMaker:
         Record a snapshot of execution quality using current RiskManager state.
         Compatible with your RiskManager.
         """
-        if not hasattr(self, "risk"):
+        if not hasattr(self, "risk") or not logger.isEnabledFor(logging.DEBUG):
             return
 
-        rm = self.risk
-        mewc_bal = rm.position.mewc_balance
-        usdt_bal = rm.position.usdt_balance
-        mewc_held = rm.position.mewc_held
-        usdt_held = rm.position.usdt_held
-        daily_pnl = rm.position.daily_pnl_usdt
-        inventory_ratio = rm.get_inventory_ratio()
-
+        snap = self.risk.snapshot()
         logger.debug(
             "Execution snapshot — mid_price=%.8f, MEWC=%.4f (held %.4f), USDT=%.4f (held %.4f), daily_pnl=%.4f, inv_ratio=%.4f",
-            mid_price, mewc_bal, mewc_held, usdt_bal, usdt_held, daily_pnl, inventory_ratio
+            mid_price, snap.mewc_balance, snap.mewc_held, snap.usdt_balance, snap.usdt_held,
+            snap.daily_pnl_usdt, snap.inventory_ratio,
         )
 
     # -------------------------------------------------------------------------
@@ -88,6 +137,7 @@ class MarketMaker:
         logger.info("=" * 60)
 
         self._running = True
+        self._stopped.clear()
         try:
             logger.info("Testing API connection...")
             conn = self.client.test_connection()
@@ -97,15 +147,34 @@ class MarketMaker:
 
             logger.info("Loading market metadata for %s...", self.exchange_cfg.symbol)
             self.client.load_market_metadata()
+            self._start_orderbook_stream()
+            self._start_user_stream()
 
+            # Cadence is kept against a monotonic schedule, so time spent
+            # inside a cycle does not push every later refresh back.
+            interval = self.cfg.refresh_interval_sec
+            next_tick = time.monotonic()
             while self._running:
+                started = time.monotonic()
                 self._cycle()
-                if stop_event is not None:
-                    stop_event.wait(timeout=self.cfg.refresh_interval_sec)
-                    if stop_event.is_set():
-                        self._running = False
-                else:
-                    time.sleep(self.cfg.refresh_interval_sec)
+                next_tick += interval
+                delay = next_tick - time.monotonic()
+                if delay <= 0:
+                    logger.warning("Cycle exceeded refresh interval by %.2fs", -delay)
+                    next_tick = time.monotonic()
+                    delay = 0.0
+                if self._wake.wait(timeout=delay):
+                    self._wake.clear()
+                    # Woken early by the book: space such cycles out so a
+                    # flickering book cannot trigger a burst of them, then
+                    # restart the schedule from here
+                    gap = started + self.MIN_WAKE_INTERVAL_SEC - time.monotonic()
+                    if gap > 0 and self._running:
+                        self._stopped.wait(gap)
+                    next_tick = time.monotonic()
+                self._wake.clear()
+                if stop_event is not None and stop_event.is_set():
+                    self._running = False
         except KeyboardInterrupt:
             logger.info("Shutdown requested by user (Ctrl+C)")
         except Exception as e:
@@ -116,6 +185,47 @@ class MarketMaker:
 
     def stop(self) -> None:
         self._running = False
+        self._stopped.set()
+        self._wake.set()
+
+    # -------------------------------------------------------------------------
+    # Orderbook stream
+    # -------------------------------------------------------------------------
+
+    def _start_orderbook_stream(self) -> None:
+        """Subscribe to the WebSocket orderbook; REST polling remains the fallback."""
+        if not self.exchange_cfg.ws_url:
+            return
+        self._ws = NonKYCWebSocketClient(
+            self.exchange_cfg.ws_url,
+            self.exchange_cfg.symbol,
+            on_book_update=self._on_book_update,
+        )
+        self._ws.start()
+
+    def _start_user_stream(self) -> None:
+        """Subscribe to execution reports; REST fill polling remains the fallback."""
+        if not self.exchange_cfg.ws_url or not self.client.api_key or not self.client.api_secret:
+            return
+        self._user_ws = NonKYCUserStream(
+            self.exchange_cfg.ws_url, self.client.api_key, self.client.api_secret,
+        )
+        self._user_ws.start()
+
+    def _fills_streamed(self) -> bool:
+        """True while execution reports cover every fill since the last REST check."""
+        user = self._user_ws
+        return user is not None and user.live and user.session == self._user_session
+
+    def _on_book_update(self, best_bid: Optional[float], best_ask: Optional[float]) -> None:
+        """Wake the main loop when the book top drifts away from our quotes."""
+        last = self._last_quote_mid
+        # A halted bot only cancels; waking it would just repeat that
+        if not best_bid or not best_ask or last <= 0 or self.risk.is_halted:
+            return
+        mid = (best_bid + best_ask) / 2.0
+        if abs(mid - last) / last > self._reprice_threshold:
+            self._wake.set()
 
     # -------------------------------------------------------------------------
     # Single refresh cycle
@@ -132,50 +242,66 @@ class MarketMaker:
             self._cancel_all()
             return
 
-        # 2. Fetch data
+        # 2. Fetch data — balances and open orders are requested up front so
+        # their round-trips overlap with the mid-price lookup
+        balances_fut = self._io_pool.submit(self.client.get_asset_balances, "MEWC", "USDT")
+        open_orders_fut = None
+        if self._active_orders and not self._fills_streamed():
+            open_orders_fut = self._io_pool.submit(
+                self.client.get_active_orders, symbol=self.exchange_cfg.symbol,
+            )
         try:
             mid_price = self._get_mid_price()
             if mid_price is None or mid_price <= 0:
                 logger.warning("Cannot determine mid-price — skipping cycle")
                 return
+            self._last_quote_mid = mid_price
         except Exception as e:
             logger.error("Error fetching orderbook: %s", e)
             return
 
         # 3. Update balances & risk state
         try:
-            self._refresh_balances(mid_price)
+            self._refresh_balances(mid_price, balances_fut.result())
             self._record_execution_quality_snapshot(mid_price)
         except Exception as e:
             logger.error("Error fetching balances: %s", e)
             return
 
         # 4. Check for filled orders and record P&L
-        self._check_and_record_fills()
-
-        # 5. Cancel existing orders
-        self._cancel_all()
+        self._check_and_record_fills(open_orders_fut)
 
-        # 6. Compute quotes
+        # 5. Compute quotes
         quotes = self._compute_quotes(mid_price)
         if not quotes:
             logger.info("No quotes to place this cycle")
+            self._cancel_all()
             return
 
-        # 7. Place orders
-        self._place_orders(quotes)
+        # 6. Cancel stale orders and place the missing ones
+        self._reprice_orders(quotes)
 
     # -------------------------------------------------------------------------
     # Price discovery
     # -------------------------------------------------------------------------
 
     def _get_mid_price(self) -> Optional[float]:
-        ob = self.client.get_orderbook(limit=5)
-        bids = ob.get("bids", [])
-        asks = ob.get("asks", [])
+        ws = self._ws
+        # Fast path: streamed book top. A silently stalled stream keeps its
+        # last book, so an old one falls through to REST.
+        if ws is not None and time.monotonic() - ws.book.updated_at < self.BOOK_MAX_AGE_SEC:
+            best_bid, best_ask = ws.book.top()
+            if best_bid and best_ask:
+                return (best_bid + best_ask) / 2.0
 
-        best_bid = float(bids[0]["price"]) if bids else None
-        best_ask = float(asks[0]["price"]) if asks else None
+        ob = self.client.get_orderbook(limit=5)
+        bids = ob.get("bids")
+        asks = ob.get("asks")
+        if bids and asks:
+            best_bid = float(bids[0]["price"])
+            best_ask = float(asks[0]["price"])
+        else:
+            best_bid = best_ask = None
 
         if best_bid and best_ask:
             mid = (best_bid + best_ask) / 2.0
@@ -197,22 +323,33 @@ class MarketMaker:
     # Balance refresh
     # -------------------------------------------------------------------------
 
-    def _refresh_balances(self, mid_price: float) -> None:
-        mewc = self.client.get_balance("MEWC")
-        usdt = self.client.get_balance("USDT")
+    def _refresh_balances(self, mid_price: float, balances: Optional[Dict[str, Dict]] = None) -> None:
+        # Both assets come from one /balances round-trip
+        if balances is None:
+            balances = self.client.get_asset_balances("MEWC", "USDT")
+        mewc = balances["MEWC"]
+        usdt = balances["USDT"]
+
+        mewc_avail = float(mewc.get("available", 0))
+        mewc_held = float(mewc.get("held", 0))
+        usdt_avail = float(usdt.get("available", 0))
+        usdt_held = float(usdt.get("held", 0))
 
         self.risk.update_balances(
-            mewc_available=float(mewc.get("available", 0)),
-            mewc_held=float(mewc.get("held", 0)),
-            usdt_available=float(usdt.get("available", 0)),
-            usdt_held=float(usdt.get("held", 0)),
+            mewc_available=mewc_avail,
+            mewc_held=mewc_held,
+            usdt_available=usdt_avail,
+            usdt_held=usdt_held,
             mid_price=mid_price,
         )
+        # Resting orders are now part of the exchange "held" balances
+        for order in self._active_orders.values():
+            self.risk.release_exposure(order.reservation)
+            order.reservation = None
 
         logger.info(
             "Balances — MEWC: %.2f avail / %.2f held | USDT: %.4f avail / %.4f held",
-            float(mewc.get("available", 0)), float(mewc.get("held", 0)),
-            float(usdt.get("available", 0)), float(usdt.get("held", 0)),
+            mewc_avail, mewc_held, usdt_avail, usdt_held,
         )
 
     # -------------------------------------------------------------------------
@@ -220,65 +357,114 @@ class MarketMaker:
     # -------------------------------------------------------------------------
 
     def _compute_quotes(self, mid_price: float) -> List[QuoteLevel]:
-        skew = self.risk.compute_inventory_skew()
-        effective_spread = max(self.cfg.spread_pct, self.cfg.min_spread_pct)
-        buy_budget = self.risk.get_available_buy_budget()
-        sell_inventory = self.risk.get_available_sell_inventory()
-
-        quotes: List[QuoteLevel] = []
-
-        for level in range(self.cfg.num_levels):
-            offset = effective_spread + (level * self.cfg.level_step_pct)
-            qty = self.cfg.base_quantity * (self.cfg.quantity_multiplier ** level)
-
+        snap = self.risk.snapshot()
+        skew = snap.skew
+        effective_spread = self._effective_spread
+        buy_budget = snap.buy_budget
+        sell_inventory = snap.sell_inventory
+
+        # Config values hoisted into locals; nothing below touches self.cfg
+        cfg = self.cfg
+        min_value = cfg.min_order_value_usdt
+        min_spread = cfg.min_spread_pct
+        min_bid_price = cfg.min_bid_price
+
+        # Whole-ladder arithmetic first: one list per quantity, indexed by level
+        levels = range(cfg.num_levels)
+        offsets = self._level_offsets
+        base_qtys = self._level_qtys
+        skew_shift = skew * effective_spread * 0.5
+        bid_prices = [mid_price * (1.0 - (offset + skew_shift)) for offset in offsets]
+        ask_prices = [mid_price * (1.0 + max(offset - skew_shift, min_spread)) for offset in offsets]
+        # Bump levels below the exchange's minimum order value
+        bid_qtys = [
+            min_value / price * 1.05 if price > 0 and qty * price < min_value else qty
+            for qty, price in zip(base_qtys, bid_prices)
+        ]
+        ask_qtys = [
+            min_value / price * 1.05 if price > 0 and qty * price < min_value else qty
+            for qty, price in zip(base_qtys, ask_prices)
+        ]
+
+        # Levels an already resting order satisfies stay as they are; they are
+        # paid for out of held balances, so only new levels are charged
+        # against the available budgets and the exposure headroom.
+        resting = {(o.quote.side, o.quote.level): o.quote for o in self._active_orders.values()}
+        keeps = self._keeps
+
+        # Single pass to apply budgets/floors and build the quote objects
+        kept: List[QuoteLevel] = []
+        new: List[QuoteLevel] = []
+        for level in levels:
             # BID
-            bid_offset = offset + (skew * effective_spread * 0.5)
-            bid_price = mid_price * (1.0 - bid_offset)
+            bid_price = bid_prices[level]
+            qty = bid_qtys[level]
             bid_cost = qty * bid_price
-            if bid_price > 0 and bid_cost < self.cfg.min_order_value_usdt:
-                qty = self.cfg.min_order_value_usdt / bid_price * 1.05
-                bid_cost = qty * bid_price
             # Enforce minimum bid price floor
-            if self.cfg.min_bid_price > 0 and bid_price < self.cfg.min_bid_price:
-                logger.debug("Bid price %.8f below min_bid_price %.8f — skipping level %d", bid_price, self.cfg.min_bid_price, level)
-                bid_price = 0  # skip this level
-            if bid_cost <= buy_budget and bid_price > 0:
-                if self.risk.check_exposure("buy", qty, bid_price):
-                    quotes.append(QuoteLevel(side="buy", price=bid_price, quantity=qty, level=level))
+            if min_bid_price > 0 and bid_price < min_bid_price:
+                logger.debug("Bid price %.8f below min_bid_price %.8f — skipping level %d", bid_price, min_bid_price, level)
+            else:
+                order = resting.get(("buy", level))
+                if order is not None and keeps(order, bid_price, qty):
+                    kept.append(order)
+                elif bid_cost <= buy_budget and bid_price > 0:
+                    new.append(QuoteLevel(side="buy", price=bid_price, quantity=qty, level=level))
                     buy_budget -= bid_cost
 
             # ASK
-            ask_offset = offset - (skew * effective_spread * 0.5)
-            ask_offset = max(ask_offset, self.cfg.min_spread_pct)
-            ask_price = mid_price * (1.0 + ask_offset)
-            ask_qty = self.cfg.base_quantity * (self.cfg.quantity_multiplier ** level)
-            if ask_price > 0 and (ask_qty * ask_price) < self.cfg.min_order_value_usdt:
-                ask_qty = self.cfg.min_order_value_usdt / ask_price * 1.05
-            if ask_qty <= sell_inventory and ask_price > 0:
-                if self.risk.check_exposure("sell", ask_qty, ask_price):
-                    quotes.append(QuoteLevel(side="sell", price=ask_price, quantity=ask_qty, level=level))
-                    sell_inventory -= ask_qty
+            ask_price = ask_prices[level]
+            ask_qty = ask_qtys[level]
+            order = resting.get(("sell", level))
+            if order is not None and keeps(order, ask_price, ask_qty):
+                kept.append(order)
+            elif ask_qty <= sell_inventory and ask_price > 0:
+                new.append(QuoteLevel(side="sell", price=ask_price, quantity=ask_qty, level=level))
+                sell_inventory -= ask_qty
+
+        # Aggregate exposure check for the new levels in one pass
+        mask = self.risk.check_exposure_batch([(q.side, q.quantity, q.price) for q in new])
+        accepted: List[QuoteLevel] = kept
+        accepted.extend(q for q, ok in zip(new, mask) if ok)
+        n_bids = sum(1 for q in accepted if q.side == "buy")
 
         logger.info(
             "Quotes computed: %d bids + %d asks | mid=%.8f skew=%.4f",
-            sum(1 for q in quotes if q.side == "buy"),
-            sum(1 for q in quotes if q.side == "sell"),
-            mid_price, skew,
+            n_bids, len(accepted) - n_bids, mid_price, skew,
         )
-        return quotes
+        return accepted
 
-    def _check_and_record_fills(self) -> None:
+    def _check_and_record_fills(self, open_orders_fut: Optional[Future] = None) -> None:
         """Check tracked orders for fills and record realized P&L to RiskManager.
 
-        Compares active_order_ids against current open orders from exchange.
-        Any tracked order that is no longer open has been filled (or cancelled).
-        We poll its status to distinguish fill from cancel and record P&L.
+        Compares active orders against current open orders from exchange.
+        Any tracked order that is no longer open has been filled, cancelled,
+        expired or rejected. We poll its status to record P&L and untrack it
+        unless the exchange still reports it as open.
+        ``open_orders_fut`` is an already submitted open-orders request.
+
+        While the user-data stream is live, queued execution reports are
+        applied instead and no REST calls are made. After a (re)subscription
+        one REST pass catches anything that happened while it was down.
         """
-        if not self._active_order_ids:
+        user = self._user_ws
+        if user is not None:
+            session = user.session if user.live else None
+            self._apply_order_reports()
+            if session is not None and session == self._user_session:
+                return
+        else:
+            session = None
+
+        if not self._active_orders:
+            if session is not None:
+                self._user_session = session
             return
 
         try:
-            open_orders_raw = self.client.get_active_orders(symbol=self.exchange_cfg.symbol)
+            if open_orders_fut is not None:
+                open_orders_raw = open_orders_fut.result()
+            else:
+                open_orders_raw = self.client.get_active_orders(symbol=self.exchange_cfg.symbol)
             open_ids = set()
             if isinstance(open_orders_raw, list):
                 for o in open_orders_raw:
@@ -289,84 +475,256 @@ class MarketMaker:
             logger.debug("Could not fetch active orders for fill check: %s", e)
             return
 
-        for oid in list(self._active_order_ids):
-            if oid in open_ids:
-                continue  # still open
-            # Order is gone — check if it was filled
+        gone = [oid for oid in self._active_orders if oid not in open_ids]
+        if session is not None:
+            self._user_session = session
+        if not gone:
+            return
+        # Order is gone — check if it was filled. The status lookups are
+        # independent, so they run side by side on the I/O pool.
+        lookups = [(oid, self._io_pool.submit(self.client.get_order, oid)) for oid in gone]
+
+        closed: List[str] = []
+        for oid, lookup in lookups:
+            active = self._active_orders[oid]
+            tracked = active.quote
             try:
-                order = self.client.get_order(oid)
+                order = lookup.result()
                 status = str(order.get("status") or order.get("state") or "").upper()
-                side = str(order.get("side") or "").lower()
+                side = str(order.get("side") or tracked.side).lower()
+                # Part of the fill may already have come in as stream reports
                 filled_qty = float(order.get("filled") or order.get("executedQty") or order.get("cumQty") or 0)
-                price = float(order.get("price") or order.get("avgPrice") or order.get("rate") or 0)
-                fee_rate = float(self.exchange_cfg.fee_maker_pct) if hasattr(self.exchange_cfg, 'fee_maker_pct') else 0.002
-                fee = filled_qty * price * fee_rate
-
-                if status in ("FILLED", "PARTIALLY_FILLED") and filled_qty > 0 and price > 0:
+                filled_qty -= active.filled
+                price = float(order.get("price") or order.get("avgPrice") or order.get("rate") or tracked.price)
+                fee = filled_qty * price * self._fee_rate
+
+                # Final and unrecognised states both take the order off the
+                # book; only an explicit open state keeps it tracked.
+                if status in _DONE_STATES or status not in _OPEN_STATES:
+                    closed.append(oid)
+                if status in _FILL_STATES and filled_qty > 0 and price > 0:
+                    active.filled += filled_qty
                     self.risk.record_fill(side=side, quantity=filled_qty, price=price, fee=fee)
                     logger.info(
                         "FILL DETECTED  id=%s  side=%s  qty=%.2f  price=%.8f  fee=%.6f",
                         oid, side, filled_qty, price, fee,
                     )
             except Exception as e:
-                logger.debug("Could not fetch order %s for fill check: %s", oid, e)
+                # Not on the open list and no status to go on: stop tracking it
+                # rather than hold its slot and re-query it every cycle.
+                logger.warning("Could not fetch order %s for fill check, untracking: %s", oid, e)
+                closed.append(oid)
+
+        # Orders that left the book no longer count against limits
+        for oid in closed:
+            self.risk.release_exposure(self._active_orders.pop(oid).reservation)
+        if closed:
+            self.risk.on_order_cancelled(len(closed))
+
+    def _apply_order_reports(self) -> None:
+        """Record fills and closes from queued user-data stream reports."""
+        reports = self._user_ws.reports
+        recently_closed = self._recently_closed
+        horizon = time.monotonic() - self.RECENTLY_CLOSED_SEC
+        while recently_closed and next(iter(recently_closed.values()))[1] < horizon:
+            recently_closed.popitem(last=False)
+
+        closed = 0
+        while True:
+            try:
+                report: OrderReport = reports.get_nowait()
+            except queue.Empty:
+                break
+            active = self._active_orders.get(report.order_id)
+            if active is None:
+                # Not ours, or already untracked; a cancelled order's last
+                # fills still count
+                entry = recently_closed.get(report.order_id)
+                if entry is not None:
+                    self._record_report_fill(report, entry[0])
+                continue
+            if self._record_report_fill(report, active.quote.side):
+                active.filled += report.trade_qty
+            if report.status in _DONE_STATES:
+                self.risk.release_exposure(self._active_orders.pop(report.order_id).reservation)
+                closed += 1
+        if closed:
+            self.risk.on_order_cancelled(closed)
+
+    def _record_report_fill(self, report: OrderReport, tracked_side: str) -> bool:
+        """Record the trade carried by a stream report, if any."""
+        if report.trade_qty <= 0 or report.trade_price <= 0:
+            return False
+        qty, price = report.trade_qty, report.trade_price
+        side = report.side or tracked_side
+        fee = report.trade_fee if report.trade_fee is not None else qty * price * self._fee_rate
+        self.risk.record_fill(side=side, quantity=qty, price=price, fee=fee)
+        logger.info(
+            "FILL DETECTED  id=%s  side=%s  qty=%.2f  price=%.8f  fee=%.6f",
+            report.order_id, side, qty, price, fee,
+        )
+        return True
+
+    def _remember_closed(self, order_id: str, order: ActiveOrder) -> None:
+        """Keep a cancelled order's side so late stream fills can be recorded."""
+        if self._user_ws is not None:
+            self._recently_closed[order_id] = (order.quote.side, time.monotonic())
 
     # -------------------------------------------------------------------------
     # Order placement & cancellation
     # -------------------------------------------------------------------------
 
     def _place_orders(self, quotes: List[QuoteLevel]) -> None:
-        existing = len(self._active_order_ids)
-        if not self.risk.check_can_place_orders(len(quotes), existing):
+        if not self.risk.can_place(len(quotes)):
             logger.warning("Risk check blocked order placement")
             return
 
+        # Format every level up front and drop those that round to zero
+        formatted = [
+            (q, self.client.format_price(q.price), self.client.format_quantity(q.quantity))
+            for q in quotes
+        ]
+        batch = []      # (quote, price_str, qty_str, reservation token)
+        for q, price_str, qty_str in formatted:
+            price_f, qty_f = float(price_str), float(qty_str)
+            if qty_f <= 0 or price_f <= 0:
+                continue
+            token = self.risk.reserve_exposure(q.side, qty_f, price_f)
+            if token is not None:
+                batch.append((q, price_str, qty_str, token))
+
+        results = []
+        if batch:
+            results = self.client.create_orders_batch([
+                {"side": q.side, "quantity": qty_str, "price": price_str}
+                for q, price_str, qty_str, _ in batch
+            ])
+
         placed = 0
-        for q in quotes:
-            try:
-                price_str = self.client.format_price(q.price)
-                qty_str = self.client.format_quantity(q.quantity)
-                if float(qty_str) <= 0 or float(price_str) <= 0:
-                    continue
-                result = self.client.create_order(side=q.side, quantity=qty_str, price=price_str)
-                order_id = result.get("id")
-                if order_id:
-                    self._active_order_ids.append(order_id)
-                    placed += 1
-                    logger.info(
-                        "PLACED  %s L%d  price=%s qty=%s  id=%s",
-                        q.side.upper(), q.level, price_str, qty_str, order_id,
-                    )
-            except Exception as e:
-                logger.error("Failed to place %s order at %s: %s", q.side, q.price, e)
+        for (q, price_str, qty_str, token), result in zip(batch, results):
+            order_id = result.get("id")
+            if not order_id:
+                self.risk.release_exposure(token)
+                if "error" in result:
+                    logger.error("Failed to place %s order at %s: %s", q.side, q.price, result["error"])
+                continue
+            self._active_orders[order_id] = ActiveOrder(quote=q, reservation=token)
+            self.risk.on_order_placed()
+            placed += 1
+            # Kept at INFO: the dashboard's LogParser rebuilds open orders from it
+            logger.info(
+                "PLACED  %s L%d  price=%s qty=%s  id=%s",
+                q.side.upper(), q.level, price_str, qty_str, order_id,
+            )
 
         logger.info("Placed %d / %d orders", placed, len(quotes))
 
-    def _cancel_all(self) -> None:
+    def _reprice_orders(self, quotes: List[QuoteLevel]) -> None:
+        """Reconcile resting orders with a freshly computed ladder.
+
+        An order whose price is within queue_reprice_threshold_pct and whose
+        size is within QTY_REPRICE_TOLERANCE of the new quote for its
+        (side, level) stays on the book and keeps its queue position;
+        everything else is cancelled and only the missing levels are placed.
+        If any of those cancels fails, all orders are cancelled and the full
+        ladder is placed again.
+        """
+        desired = {(q.side, q.level): q for q in quotes}
+        stale: List[str] = []
+        for oid, order in self._active_orders.items():
+            key = (order.quote.side, order.quote.level)
+            q = desired.get(key)
+            if q is None:
+                stale.append(oid)
+                continue
+            if self._keeps(order.quote, q.price, q.quantity):
+                del desired[key]
+            else:
+                stale.append(oid)
+
+        if len(stale) == len(self._active_orders):
+            self._cancel_all()
+        elif stale and self._cancel_orders(stale):
+            # A stale order may still be live: fall back to the bulk cancel
+            # and requote the whole ladder rather than quote next to it.
+            logger.warning("Stale order cancel failed, cancelling all orders")
+            self._cancel_all()
+            desired = {(q.side, q.level): q for q in quotes}
+
+        if desired:
+            self._place_orders(list(desired.values()))
+        else:
+            logger.info("All %d quotes already on the book", len(quotes))
+
+    def _keeps(self, resting: QuoteLevel, price: float, quantity: float) -> bool:
+        """True if a resting order is close enough to a new quote to stay put."""
+        return (abs(price - resting.price) <= self._reprice_threshold * resting.price
+                and abs(quantity - resting.quantity) <= self.QTY_REPRICE_TOLERANCE * resting.quantity)
+
+    def _cancel_orders(self, order_ids: List[str]) -> List[str]:
+        """Cancel specific tracked orders and stop tracking the cancelled ones.
+
+        Orders whose cancel failed stay tracked (they may still be live) and
+        are returned.
+        """
+        results = self.client.cancel_orders_batch(order_ids)
+        failed: List[str] = []
         cancelled = 0
-        for oid in self._active_order_ids:
-            try:
-                self.client.cancel_order(oid)
+        for oid, result in zip(order_ids, results):
+            if "error" in result:
+                logger.debug("Cancel order %s failed (may already be filled): %s", oid, result["error"])
+                failed.append(oid)
+                continue
+            order = self._active_orders.pop(oid, None)
+            if order is not None:
+                self.risk.release_exposure(order.reservation)
+                self._remember_closed(oid, order)
                 cancelled += 1
-            except Exception as e:
-                logger.debug("Cancel order %s failed (may already be filled): %s", oid, e)
-
-        if self._active_order_ids:
-            logger.info("Cancelled %d / %d tracked orders", cancelled, len(self._active_order_ids))
+        if cancelled:
+            self.risk.on_order_cancelled(cancelled)
+        logger.info("Cancelled %d stale orders, %d kept", cancelled, len(self._active_orders))
+        return failed
 
-        self._active_order_ids.clear()
+    def _cancel_all(self) -> None:
+        tracked = len(self._active_orders)
 
-        # Safety net: bulk cancel catches any orphaned orders (placed without returned ID)
+        # One round-trip: the symbol-wide bulk cancel also catches orphaned
+        # orders (placed without a returned ID). Fall back to per-ID cancels.
         try:
             self.client.cancel_all_orders()
+            if tracked:
+                logger.info("Cancelled %d tracked orders (bulk)", tracked)
         except Exception as e:
-            logger.debug("Bulk safety-cancel: %s", e)
+            logger.debug("Bulk cancel failed, cancelling by ID: %s", e)
+            order_ids = list(self._active_orders)
+            results = self.client.cancel_orders_batch(order_ids)
+            for oid, result in zip(order_ids, results):
+                if "error" in result:
+                    logger.debug("Cancel order %s failed (may already be filled): %s", oid, result["error"])
+            if tracked and logger.isEnabledFor(logging.INFO):
+                cancelled = sum(1 for r in results if "error" not in r)
+                logger.info("Cancelled %d / %d tracked orders", cancelled, tracked)
+
+        self._clear_active_orders()
+
+    def _clear_active_orders(self) -> None:
+        """Forget all tracked orders and return their risk reservations."""
+        for oid, order in self._active_orders.items():
+            self.risk.release_exposure(order.reservation)
+            self._remember_closed(oid, order)
+        self.risk.on_order_cancelled(len(self._active_orders))
+        self._active_orders.clear()
 
     def _shutdown(self) -> None:
         logger.info("Shutting down — cancelling all open orders...")
+        for stream in (self._ws, self._user_ws):
+            if stream is not None:
+                stream.stop()
+        self._ws = self._user_ws = None
         try:
             self.client.cancel_all_orders()
         except Exception as e:
             logger.error("Error cancelling orders during shutdown: %s", e)
-        self._active_order_ids.clear()
+        self._clear_active_orders()
+        self._io_pool.shutdown(wait=False, cancel_futures=True)
         logger.info("Market Maker stopped. Total cycles: %d", self._cycle_count)
@@ -0,0 +1,292 @@
+"""
+NonKYC WebSocket clients for the Meowcoin Market Maker.
+
+Keeps a local copy of the orderbook up to date from the exchange's push
+stream so the strategy can read the book top without a REST round-trip,
+and delivers the account's order execution reports so fills are recorded
+without polling. The bot itself is synchronous, so each stream runs in a
+background daemon thread and reconnects automatically.
+"""
+
+import hashlib
+import hmac
+import json
+import logging
+import queue
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, Iterable, NamedTuple, Optional, Tuple
+
+from websockets.exceptions import WebSocketException
+from websockets.sync.client import connect
+
+from market_maker.exchange_client import json_loads
+
+logger = logging.getLogger("mewc_mm.ws")
+
+BookTopCallback = Callable[[Optional[float], Optional[float]], None]
+
+
+def _parse_level(level) -> Tuple[float, float]:
+    """Accept both {"price": .., "quantity": ..} and [price, quantity] levels."""
+    if isinstance(level, dict):
+        return float(level.get("price", 0)), float(level.get("quantity", 0))
+    return float(level[0]), float(level[1])
+
+
+class LocalOrderBook:
+    """In-memory orderbook maintained from snapshot + delta messages."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._bids: Dict[float, float] = {}
+        self._asks: Dict[float, float] = {}
+        # Book top published as one tuple: the feed thread swaps the reference
+        # in a single store, so readers never see a bid from one update paired
+        # with an ask from another and need no lock.
+        self._top: Tuple[Optional[float], Optional[float]] = (None, None)
+        self._synced = False
+        self.updated_at = 0.0   # time.monotonic() of the last applied message
+
+    def apply_snapshot(self, bids: Iterable, asks: Iterable) -> None:
+        """Replace the whole book."""
+        with self._lock:
+            self._bids.clear()
+            self._asks.clear()
+            self._apply(bids, asks)
+            self._synced = True
+
+    def apply_update(self, bids: Iterable, asks: Iterable) -> None:
+        """Apply a delta; a zero quantity removes the price level."""
+        with self._lock:
+            if self._synced:
+                self._apply(bids, asks)
+
+    def clear(self) -> None:
+        """Drop all state (e.g. on disconnect) until the next snapshot."""
+        with self._lock:
+            self._bids.clear()
+            self._asks.clear()
+            self._top = (None, None)
+            self._synced = False
+
+    def top(self) -> Tuple[Optional[float], Optional[float]]:
+        """Best bid and best ask, or (None, None) while not synced."""
+        return self._top
+
+    def _apply(self, bids: Iterable, asks: Iterable) -> None:
+        for side, levels in ((self._bids, bids), (self._asks, asks)):
+            for level in levels or ():
+                price, qty = _parse_level(level)
+                if qty > 0:
+                    side[price] = qty
+                else:
+                    side.pop(price, None)
+        self._top = (
+            max(self._bids) if self._bids else None,
+            min(self._asks) if self._asks else None,
+        )
+        self.updated_at = time.monotonic()
+
+
+class _StreamClient(ABC):
+    """Reconnecting WebSocket subscription run on a background daemon thread.
+
+    Subclasses send their subscription in _on_connect() and consume frames
+    in _handle_message(); _on_disconnect() drops any state tied to the
+    connection.
+    """
+
+    RECONNECT_DELAY_SEC = 5.0
+    STREAM_NAME = "Stream"
+
+    def __init__(self, ws_url: str):
+        self.ws_url = ws_url
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._ws = None
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True, name=f"{self.STREAM_NAME}WS")
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        ws = self._ws
+        if ws is not None:
+            try:
+                ws.close()
+            except Exception:
+                pass
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        self._on_disconnect()
+
+    # -------------------------------------------------------------------------
+    # Stream handling
+    # -------------------------------------------------------------------------
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                with connect(self.ws_url, open_timeout=10) as ws:
+                    self._ws = ws
+                    self._on_connect(ws)
+                    for raw in ws:
+                        if self._stop.is_set():
+                            break
+                        try:
+                            msg = json_loads(raw)
+                        except ValueError:
+                            continue
+                        if isinstance(msg, dict):
+                            self._handle_message(msg)
+            except (OSError, WebSocketException) as e:
+                if not self._stop.is_set():
+                    logger.warning("%s stream disconnected: %s", self.STREAM_NAME, e)
+            except Exception as e:
+                logger.exception("%s stream error: %s", self.STREAM_NAME, e)
+            finally:
+                self._ws = None
+                self._on_disconnect()
+
+            self._stop.wait(self.RECONNECT_DELAY_SEC)
+
+    @abstractmethod
+    def _on_connect(self, ws) -> None:
+        """Send the subscription on a freshly opened connection."""
+
+    @abstractmethod
+    def _handle_message(self, msg: Dict) -> None:
+        """Consume one decoded frame."""
+
+    def _on_disconnect(self) -> None:
+        pass
+
+
+class NonKYCWebSocketClient(_StreamClient):
+    """Background orderbook subscription for a single symbol."""
+
+    STREAM_NAME = "Orderbook"
+
+    def __init__(self, ws_url: str, symbol: str, depth: int = 20,
+                 on_book_update: Optional[BookTopCallback] = None):
+        super().__init__(ws_url)
+        self.symbol = symbol
+        self.depth = depth
+        self.book = LocalOrderBook()
+        self._on_book_update = on_book_update
+
+    def _on_connect(self, ws) -> None:
+        ws.send(json.dumps({
+            "method": "subscribeOrderbook",
+            "params": {"symbol": self.symbol, "limit": self.depth},
+            "id": 1,
+        }))
+        logger.info("Orderbook stream connected: %s %s", self.ws_url, self.symbol)
+
+    def _on_disconnect(self) -> None:
+        self.book.clear()
+
+    def _handle_message(self, msg: Dict) -> None:
+        method = msg.get("method")
+        params = msg.get("params") or {}
+        if method == "snapshotOrderbook":
+            self.book.apply_snapshot(params.get("bids"), params.get("asks"))
+        elif method == "updateOrderbook":
+            self.book.apply_update(params.get("bids"), params.get("asks"))
+        else:
+            if "error" in msg:
+                logger.warning("Orderbook stream error reply: %s", msg["error"])
+            return
+
+        if self._on_book_update is not None:
+            best_bid, best_ask = self.book.top()
+            self._on_book_update(best_bid, best_ask)
+
+
+class OrderReport(NamedTuple):
+    """One execution report from the user-data stream."""
+    order_id: str
+    side: str           # "buy" / "sell"
+    status: str         # upper snake case, e.g. "PARTIALLY_FILLED", "CANCELED"
+    trade_qty: float    # quantity executed by this report (0 if not a trade)
+    trade_price: float
+    trade_fee: Optional[float]
+
+
+_CAMEL_BOUNDARY = re.compile(r"(?<=[a-z])(?=[A-Z])")
+
+
+def _status_key(status: str) -> str:
+    """'partiallyFilled' / 'PARTIALLY_FILLED' -> 'PARTIALLY_FILLED'."""
+    return _CAMEL_BOUNDARY.sub("_", status).upper()
+
+
+class NonKYCUserStream(_StreamClient):
+    """Authenticated order-report subscription.
+
+    Reports are queued on ``reports`` for the strategy thread to drain.
+    ``live`` is true between a confirmed subscription and the next
+    disconnect; ``session`` increases with every confirmed subscription so
+    the consumer can tell when reports may have been missed.
+    """
+
+    STREAM_NAME = "UserData"
+    _LOGIN_ID = 1
+    _SUBSCRIBE_ID = 2
+
+    def __init__(self, ws_url: str, api_key: str, api_secret: str):
+        super().__init__(ws_url)
+        self.api_key = api_key
+        self.api_secret = api_secret
+        self.reports: "queue.SimpleQueue[OrderReport]" = queue.SimpleQueue()
+        self.session = 0
+        self.live = False
+
+    def _on_connect(self, ws) -> None:
+        nonce = str(int(time.time() * 1e3))
+        signature = hmac.new(self.api_secret.encode(), nonce.encode(), hashlib.sha256).hexdigest()
+        ws.send(json.dumps({
+            "method": "login",
+            "params": {"algo": "HS256", "pKey": self.api_key, "nonce": nonce, "signature": signature},
+            "id": self._LOGIN_ID,
+        }))
+        ws.send(json.dumps({"method": "subscribeReports", "params": {}, "id": self._SUBSCRIBE_ID}))
+
+    def _on_disconnect(self) -> None:
+        self.live = False
+
+    def _handle_message(self, msg: Dict) -> None:
+        if "error" in msg:
+            logger.warning("User-data stream error reply: %s", msg["error"])
+            return
+        if msg.get("id") == self._SUBSCRIBE_ID and msg.get("result"):
+            self.session += 1
+            self.live = True
+            logger.info("User-data stream subscribed: %s", self.ws_url)
+            return
+        if msg.get("method") != "report":
+            return
+
+        params = msg.get("params")
+        for report in params if isinstance(params, list) else (params,):
+            if not isinstance(report, dict):
+                continue
+            order_id = str(report.get("id") or "")
+            if not order_id:
+                continue
+            fee = report.get("tradeFee")
+            self.reports.put(OrderReport(
+                order_id=order_id,
+                side=str(report.get("side") or "").lower(),
+                status=_status_key(str(report.get("status") or "")),
+                trade_qty=float(report.get("tradeQuantity") or 0),
+                trade_price=float(report.get("tradePrice") or 0),
+                trade_fee=float(fee) if fee is not None else None,
+            ))
@@ -1,15 +1,12 @@
 import asyncio
 from concurrent.futures import ThreadPoolExecutor
 
-from fastapi.testclient import TestClient
+import httpx
 
 from dashboard.backend.data_store import DataStore
 from dashboard.web.app import app
 
 
-client = TestClient(app)
-
-
 def test_datastore_dedupe_key_and_unique_insert(tmp_path):
     ds = DataStore(db_path=tmp_path / "t.db")
     payload = dict(side="BUY", quantity=10.0, price=1.25, fee=0.1, order_id="ord-1", source_trade_id="tr-1", timestamp="2024-01-01T00:00:00")
@@ -54,15 +51,90 @@ def test_heavy_endpoints_concurrent_load_no_500():
     ]
 
     async def run_calls():
-        async def one(method: str, url: str, body):
-            return await asyncio.to_thread(
-                client.post if method == "POST" else client.get,
-                url,
-                json=body,
-            ) if method == "POST" else await asyncio.to_thread(client.get, url)
-
-        tasks = [one(m, u, b) for _ in range(5) for (m, u, b) in endpoints]
-        return await asyncio.gather(*tasks)
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as ac:
+            tasks = [ac.request(m, u, json=b) for _ in range(5) for (m, u, b) in endpoints]
+            return await asyncio.gather(*tasks)
 
     responses = asyncio.run(run_calls())
     assert all(r.status_code < 500 for r in responses)
+
+
+def test_add_trades_batches_and_dedupes(tmp_path):
+    ds = DataStore(db_path=tmp_path / "batch.db")
+    rows = [
+        dict(side="BUY", quantity=1.0, price=2.0, fee=0.0, order_id="o-1", timestamp="2024-01-01T00:00:00"),
+        dict(side="SELL", quantity=1.0, price=2.5, fee=0.0, order_id="o-2", timestamp="2024-01-01T00:01:00"),
+        dict(side="BUY", quantity=1.0, price=2.0, fee=0.0, order_id="o-1", timestamp="2024-01-01T00:00:00"),
+    ]
+
+    assert ds.add_trades(rows) == 2
+    assert ds.add_trades(rows) == 0
+    assert ds.add_trades([]) == 0
+    assert len(ds.get_trades(limit=50, days=3650)) == 2
+
+
+def test_snapshots_are_buffered_but_visible_to_reads(tmp_path):
+    ds = DataStore(db_path=tmp_path / "snap.db")
+    for v in (100.0, 101.0, 102.0):
+        ds.add_snapshot(v)
+
+    # Only the first write goes straight through; the rest wait for a batch
+    assert ds.conn.execute("SELECT COUNT(*) FROM portfolio_snapshots").fetchone()[0] == 1
+    assert [r["total_value_usdt"] for r in ds.get_portfolio_history(1)] == [100.0, 101.0, 102.0]
+
+    ds.add_snapshot(103.0)
+    ds.flush()
+    assert ds.conn.execute("SELECT COUNT(*) FROM portfolio_snapshots").fetchone()[0] == 4
+
+
+def test_pnl_is_cached_until_a_trade_is_added(tmp_path):
+    from dashboard.backend.calculator import PnLCalculator
+
+    ds = DataStore(db_path=tmp_path / "pnl.db")
+    calc = PnLCalculator(ds)
+    ds.add_trade("BUY", 10.0, 1.0, order_id="o-1")
+
+    first = calc.get_current_pnl()
+    assert calc.get_current_pnl() is first
+
+    ds.add_trade("BUY", 10.0, 1.0, order_id="o-1", timestamp=ds.get_trades()[0]["timestamp"])  # duplicate
+    assert calc.get_current_pnl() is first
+
+    ds.add_trades([dict(side="SELL", quantity=10.0, price=2.0, order_id="o-2")])
+    second = calc.get_current_pnl()
+    assert second is not first
+    assert second["daily"]["net"] == 10.0
+
+
+def test_pnl_windows_come_from_one_trade_query(tmp_path):
+    from datetime import datetime, timedelta
+
+    from dashboard.backend.calculator import PnLCalculator
+
+    ds = DataStore(db_path=tmp_path / "windows.db")
+    now = datetime.now()
+    for days_ago, side, price in ((20, "BUY", 1.0), (3, "SELL", 2.0), (3, "BUY", 1.0), (0, "SELL", 1.5)):
+        ts = (now - timedelta(days=days_ago, minutes=1)).isoformat()
+        ds.add_trade(side, 10.0, price, order_id=f"{side}-{days_ago}", timestamp=ts)
+
+    calls = []
+    get_trades = ds.get_trades
+    ds.get_trades = lambda **kw: calls.append(kw) or get_trades(**kw)
+    pnl = PnLCalculator(ds).get_current_pnl()
+
+    assert len(calls) == 1
+    assert [pnl[p]["trades"] for p in ("daily", "weekly", "monthly")] == [1, 3, 4]
+    assert pnl["daily"]["net"] == 0.0       # lone sell without a prior buy in the window
+    assert pnl["weekly"]["net"] == 5.0
+    assert pnl["monthly"]["net"] == 15.0
+
+
+def test_close_writes_buffered_snapshots(tmp_path):
+    ds = DataStore(db_path=tmp_path / "close.db")
+    ds.add_snapshot(100.0)
+    ds.add_snapshot(101.0)   # still buffered
+    ds.close()
+
+    reopened = DataStore(db_path=tmp_path / "close.db")
+    assert [r["total_value_usdt"] for r in reopened.get_portfolio_history(1)] == [100.0, 101.0]
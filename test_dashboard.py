@@ -1,48 +1,63 @@
+import asyncio
+
+import httpx
+import pytest
 from fastapi.testclient import TestClient
 
 from dashboard.web.app import app, build_confirm_token, manual_order_preflight
 from dashboard.backend.services import TradingService
 
-client = TestClient(app)
-
-
-def test_dashboard_core_endpoints_no_500():
-    checks = [
-        ("GET", "/"),
-        ("GET", "/api/price"),
-        ("GET", "/api/portfolio"),
-        ("GET", "/api/pnl"),
-        ("GET", "/api/pnl-saldo"),
-        ("GET", "/api/win-rate"),
-        ("GET", "/api/fills"),
-        ("POST", "/api/trades/sync-from-exchange"),
-        ("POST", "/api/orders/cancel-all"),
-        ("GET", "/api/risk-cockpit"),
-        ("GET", "/api/backtest-replay-summary"),
-        ("GET", "/api/strategy-journal"),
-        ("GET", "/api/automation-rules"),
-        ("GET", "/api/open-orders"),
-        ("GET", "/api/orderbook"),
-        ("GET", "/api/history"),
-        ("GET", "/api/bot-status"),
-        ("GET", "/api/order-lifecycle"),
-        ("GET", "/api/order-lifecycle-metrics"),
-        ("GET", "/api/errors"),
-        ("GET", "/api/profitability"),
-        ("GET", "/api/execution-quality"),
-        ("GET", "/api/live-risk"),
-        ("GET", "/api/live-pnl"),
-        ("POST", "/api/backtest/import"),
-        ("GET", "/api/backtest/compare"),
-        ("GET", "/api/strategy-reason-trace"),
-    ]
-
-    for method, url in checks:
-        if method == "GET":
-            res = client.get(url)
-        else:
-            payload = {"dataset": "d", "candles": 10} if url == "/api/backtest/import" else None
-            res = client.post(url, json=payload) if payload else client.post(url)
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(app) as c:
+        yield c
+
+
+CORE_ENDPOINTS = (
+    ("GET", "/", None),
+    ("GET", "/api/price", None),
+    ("GET", "/api/portfolio", None),
+    ("GET", "/api/pnl", None),
+    ("GET", "/api/pnl-saldo", None),
+    ("GET", "/api/win-rate", None),
+    ("GET", "/api/fills", None),
+    ("POST", "/api/trades/sync-from-exchange", None),
+    ("POST", "/api/orders/cancel-all", None),
+    ("GET", "/api/risk-cockpit", None),
+    ("GET", "/api/backtest-replay-summary", None),
+    ("GET", "/api/strategy-journal", None),
+    ("GET", "/api/automation-rules", None),
+    ("GET", "/api/open-orders", None),
+    ("GET", "/api/orderbook", None),
+    ("GET", "/api/history", None),
+    ("GET", "/api/bot-status", None),
+    ("GET", "/api/order-lifecycle", None),
+    ("GET", "/api/order-lifecycle-metrics", None),
+    ("GET", "/api/errors", None),
+    ("GET", "/api/profitability", None),
+    ("GET", "/api/execution-quality", None),
+    ("GET", "/api/live-risk", None),
+    ("GET", "/api/live-pnl", None),
+    ("POST", "/api/backtest/import", {"dataset": "d", "candles": 10}),
+    ("GET", "/api/backtest/compare", None),
+    ("GET", "/api/strategy-reason-trace", None),
+)
+
+
+@pytest.mark.parametrize("method,url,payload", CORE_ENDPOINTS)
+def test_dashboard_core_endpoints_no_500(client, method, url, payload):
+    res = client.request(method, url, json=payload)
+    assert res.status_code < 500, f"{method} {url} failed with {res.status_code}: {res.text[:300]}"
+
+
+def test_dashboard_core_endpoints_concurrently_no_500():
+    async def run_all():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as ac:
+            return await asyncio.gather(*(ac.request(m, u, json=p) for m, u, p in CORE_ENDPOINTS))
+
+    for (method, url, _), res in zip(CORE_ENDPOINTS, asyncio.run(run_all())):
         assert res.status_code < 500, f"{method} {url} failed with {res.status_code}: {res.text[:300]}"
 
 
@@ -66,7 +81,7 @@ def test_manual_preflight_and_confirm_token_deterministic():
     assert p1["confirm_token"] == expected
 
 
-def test_manual_order_invalid_payload_returns_error_message():
+def test_manual_order_invalid_payload_returns_error_message(client):
     res = client.post("/api/orders/manual", json={"side": "INVALID", "quantity": 0})
     assert res.status_code == 200
     body = res.json()
@@ -74,7 +89,7 @@ def test_manual_order_invalid_payload_returns_error_message():
     assert body.get("error")
 
 
-def test_builder_and_preflight_endpoints_payloads():
+def test_builder_and_preflight_endpoints_payloads(client):
     pre = client.post(
         "/api/orders/preflight",
         json={"side": "BUY", "type": "LIMIT", "quantity": 1000, "price": 0.00004, "reduce_only": True},
@@ -100,10 +115,12 @@ def test_builder_and_preflight_endpoints_payloads():
 
 
 if __name__ == "__main__":
-    test_dashboard_core_endpoints_no_500()
-    test_manual_preflight_and_confirm_token_deterministic()
-    test_manual_order_invalid_payload_returns_error_message()
-    test_builder_and_preflight_endpoints_payloads()
+    with TestClient(app) as c:
+        for method, url, payload in CORE_ENDPOINTS:
+            test_dashboard_core_endpoints_no_500(c, method, url, payload)
+        test_manual_preflight_and_confirm_token_deterministic()
+        test_manual_order_invalid_payload_returns_error_message(c)
+        test_builder_and_preflight_endpoints_payloads(c)
     print("Dashboard global tests passed")
 
 
@@ -123,7 +140,7 @@ def test_open_orders_filter_excludes_closed_items():
     assert [r["id"] for r in rows] == ["2"]
 
 
-def test_price_endpoint_parses_snake_case_payload(monkeypatch):
+def test_price_endpoint_parses_snake_case_payload():
     from dashboard.web import app as app_mod
 
     class Resp:
@@ -138,8 +155,82 @@ def test_price_endpoint_parses_snake_case_payload(monkeypatch):
                 "usd_volume_est": "99.5",
             }
 
-    monkeypatch.setattr(app_mod.requests, "get", lambda *args, **kwargs: Resp())
-    data = app_mod.get_price_data()
+    class StubSession:
+        def get(self, *args, **kwargs):
+            return Resp()
+
+    data = app_mod.get_price_data(StubSession())
 
     assert data["last_price"] == 0.123
     assert data["volume"] == 99.5
+
+
+def test_ttl_cache_reuses_response_and_serves_stale_on_error():
+    from dashboard.web.app import ttl_cache
+
+    calls = []
+
+    @ttl_cache(60)
+    async def handler(limit: int = 1):
+        calls.append(limit)
+        if len(calls) > 2:
+            raise RuntimeError("exchange down")
+        return {"limit": limit}
+
+    async def run():
+        first = await asyncio.gather(*(handler(limit=5) for _ in range(5)))
+        other = await handler(limit=6)
+        return first, other
+
+    first, other = asyncio.run(run())
+    assert calls == [5, 6]
+    assert all(r == {"limit": 5} for r in first) and other == {"limit": 6}
+
+    key = (("limit", 5),)
+    handler.cache[key] = (0.0, handler.cache[key][1])   # force expiry
+    assert asyncio.run(handler(limit=5)) == {"limit": 5}
+    assert calls == [5, 6, 5]
+
+
+def test_ttl_cache_is_bounded_and_drops_expired_entries():
+    from dashboard.web.app import ttl_cache
+
+    @ttl_cache(60, maxsize=3)
+    async def handler(limit: int = 1):
+        return limit
+
+    async def run(limits):
+        for limit in limits:
+            await handler(limit=limit)
+
+    asyncio.run(run(range(10)))
+    assert [k[0][1] for k in handler.cache] == [7, 8, 9]
+
+    handler.cache[(("limit", 7),)] = (0.0, 7)   # expired
+    asyncio.run(run([20]))
+    assert [k[0][1] for k in handler.cache] == [8, 9, 20]
+
+
+def test_limit_preflight_skips_ticker_lookup(monkeypatch):
+    from dashboard.web import app as app_mod
+
+    def no_ticker():
+        raise AssertionError("ticker fetched for a priced limit order")
+
+    monkeypatch.setattr(app_mod, "get_price_data", no_ticker)
+    pre = manual_order_preflight({"side": "BUY", "type": "LIMIT", "quantity": 1000, "price": 0.002})
+    assert pre["ok"] is True
+    assert pre["effective_price"] == 0.002
+
+
+def test_log_parser_tail_reads_only_the_last_lines(tmp_path):
+    from dashboard.backend.log_parser import LogParser
+
+    log = tmp_path / "market_maker.log"
+    log.write_text("".join(f"2024-01-01 00:00:00 | INFO | line {i} żółw\n" for i in range(500)))
+    parser = LogParser(log)
+    parser.TAIL_CHUNK = 97   # force many chunk boundaries, some inside multi-byte chars
+
+    assert parser.tail(3) == [f"2024-01-01 00:00:00 | INFO | line {i} żółw" for i in (497, 498, 499)]
+    assert len(parser.tail(1000)) == 500
+    assert parser.tail(0) == []
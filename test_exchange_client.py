@@ -0,0 +1,51 @@
+import threading
+import time
+
+from market_maker.config import ExchangeConfig
+from market_maker.exchange_client import NonKYCClient
+
+
+def test_cancel_orders_batch_fans_out_and_keeps_order():
+    client = NonKYCClient(ExchangeConfig())
+    threads = set()
+
+    def cancel_order(order_id):
+        threads.add(threading.current_thread().name)
+        time.sleep(0.01)
+        if order_id == "b":
+            raise RuntimeError("Exchange error: order not found")
+        return {"id": order_id}
+
+    client.cancel_order = cancel_order
+    results = client.cancel_orders_batch(["a", "b", "c", "d"])
+
+    assert results[0] == {"id": "a"}
+    assert "not found" in results[1]["error"]
+    assert [r.get("id") for r in results[2:]] == ["c", "d"]
+    assert len(threads) > 1
+
+
+def test_nonces_strictly_increase():
+    client = NonKYCClient(ExchangeConfig())
+    nonces = [int(client._next_nonce()) for _ in range(50)]
+    assert nonces == sorted(set(nonces))
+
+
+def test_create_orders_batch_returns_per_order_results():
+    client = NonKYCClient(ExchangeConfig())
+
+    def create_order(side, quantity, price):
+        if price == "bad":
+            raise RuntimeError("Exchange error: invalid price")
+        return {"id": f"{side}-{price}"}
+
+    client.create_order = create_order
+    results = client.create_orders_batch([
+        {"side": "buy", "quantity": "1", "price": "0.5"},
+        {"side": "sell", "quantity": "1", "price": "bad"},
+        {"side": "sell", "quantity": "1", "price": "0.7"},
+    ])
+
+    assert results[0] == {"id": "buy-0.5"}
+    assert "invalid price" in results[1]["error"]
+    assert results[2] == {"id": "sell-0.7"}
@@ -0,0 +1,137 @@
+from market_maker.config import RiskConfig
+from market_maker.risk_manager import RiskManager
+
+
+def test_halt_blocks_pre_order_checks_until_resume():
+    rm = RiskManager(RiskConfig())
+
+    assert rm.check_can_place_orders(1, 0) is True
+    assert rm.check_exposure("buy", 10.0, 1.0) is True
+
+    rm.halt("manual")
+    assert rm.is_halted is True
+    assert rm.halt_reason == "manual"
+    assert rm.check_can_place_orders(1, 0) is False
+    assert rm.check_exposure("buy", 10.0, 1.0) is False
+
+    rm.resume()
+    assert rm.is_halted is False
+    assert rm.check_can_place_orders(1, 0) is True
+
+
+def test_reserve_exposure_respects_aggregate_headroom():
+    rm = RiskManager(RiskConfig(max_usdt_exposure=100.0, max_mewc_exposure=50.0))
+
+    t1 = rm.reserve_exposure("buy", 60.0, 1.0)
+    assert t1 is not None
+    assert rm.reserve_exposure("buy", 50.0, 1.0) is None
+
+    rm.release_exposure(t1)
+    assert rm.reserve_exposure("buy", 50.0, 1.0) is not None
+
+    assert rm.reserve_exposure("sell", 40.0, 1.0) is not None
+    assert rm.reserve_exposure("sell", 20.0, 1.0) is None
+
+
+def test_periodic_check_halts_on_stop_loss():
+    rm = RiskManager(RiskConfig(stop_loss_usdt=-50.0, daily_loss_limit_usdt=-100.0))
+    rm.update_balances(1000.0, 0.0, 100.0, 0.0, mid_price=0.1)
+    rm.periodic_check()
+    assert rm.is_halted is False
+
+    rm.update_balances(1000.0, 0.0, 40.0, 0.0, mid_price=0.1)
+    rm.periodic_check()
+    assert rm.is_halted is True
+    assert rm.halt_reason.startswith("Stop-loss triggered")
+
+
+def test_record_fill_charges_fee_on_both_sides():
+    rm = RiskManager(RiskConfig())
+    rm.record_fill("buy", 100.0, 0.5, fee=0.1)
+    assert abs(rm.position.daily_pnl_usdt - (-50.1)) < 1e-9
+    rm.record_fill("sell", 100.0, 0.6, fee=0.1)
+    assert abs(rm.position.daily_pnl_usdt - 9.8) < 1e-9
+
+
+def test_inventory_skew_is_clamped_and_scaled():
+    rm = RiskManager(RiskConfig(inventory_target_ratio=0.5, inventory_skew_factor=0.5))
+    rm.update_balances(1000.0, 0.0, 0.0, 0.0, mid_price=1.0)
+    assert rm.compute_inventory_skew() == 0.5
+
+    rm.update_balances(500.0, 0.0, 500.0, 0.0, mid_price=1.0)
+    assert rm.compute_inventory_skew() == 0.0
+
+
+def test_check_exposure_batch_uses_cumulative_headroom():
+    rm = RiskManager(RiskConfig(max_usdt_exposure=100.0, max_mewc_exposure=300.0))
+    mask = rm.check_exposure_batch([
+        ("buy", 40.0, 1.0),
+        ("sell", 100.0, 1.0),
+        ("buy", 50.0, 1.0),
+        ("sell", 150.0, 1.0),
+        ("buy", 20.0, 1.0),
+        ("sell", 100.0, 1.0),
+    ])
+    assert mask == [True, True, True, True, False, False]
+
+    rm.halt("test")
+    assert rm.check_exposure_batch([("buy", 1.0, 1.0)]) == [False]
+
+
+def test_available_budgets_follow_balance_updates():
+    rm = RiskManager(RiskConfig(max_balance_usage_pct=0.5))
+    assert rm.get_available_buy_budget() == 0.0
+    rm.update_balances(200.0, 10.0, 40.0, 5.0, mid_price=0.1)
+    assert rm.get_available_buy_budget() == 20.0
+    assert rm.get_available_sell_inventory() == 100.0
+
+
+def test_position_state_buffer_is_live_view():
+    from market_maker.risk_manager import DAILY_PNL_USDT, PositionState
+
+    pos = PositionState(mewc_balance=5.0)
+    view = pos.buffer()
+    pos.daily_pnl_usdt = -3.5
+    assert view[DAILY_PNL_USDT] == -3.5
+    assert pos.mewc_balance == 5.0
+    assert len(view) == 9
+
+
+def test_can_place_tracks_open_orders_via_callbacks():
+    rm = RiskManager(RiskConfig(max_open_orders=4))
+    assert rm.can_place(4) is True
+
+    rm.on_order_placed(3)
+    assert rm.open_orders == 3
+    assert rm.can_place(1) is True
+    assert rm.can_place(2) is False
+
+    rm.on_order_cancelled(5)
+    assert rm.open_orders == 0
+    assert rm.can_place(4) is True
+
+
+def test_intraday_kill_switch_needs_consecutive_losses():
+    rm = RiskManager(RiskConfig(intraday_max_consecutive_losses=3))
+    for pnl in (-1.0, -1.0, 0.5, -1.0, -1.0):
+        rm.register_realized_pnl(pnl)
+    assert rm.is_halted is False
+
+    rm.register_realized_pnl(-1.0)
+    assert rm.is_halted is True
+    assert "3 consecutive" in rm.halt_reason
+
+
+def test_snapshot_matches_individual_getters():
+    rm = RiskManager(RiskConfig(inventory_target_ratio=0.5, inventory_skew_factor=0.5))
+    rm.update_balances(800.0, 200.0, 300.0, 100.0, mid_price=0.5)
+    rm.record_fill("sell", 10.0, 0.5)
+
+    snap = rm.snapshot()
+
+    assert snap.mewc_balance == 800.0 and snap.usdt_held == 100.0
+    assert snap.daily_pnl_usdt == rm.position.daily_pnl_usdt
+    assert snap.inventory_ratio == rm.get_inventory_ratio()
+    assert snap.skew == rm.compute_inventory_skew()
+    assert snap.buy_budget == rm.get_available_buy_budget()
+    assert snap.sell_inventory == rm.get_available_sell_inventory()
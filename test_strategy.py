@@ -0,0 +1,366 @@
+from market_maker.config import BotConfig
+from market_maker.risk_manager import RiskManager
+from market_maker.strategy import MarketMaker, QuoteLevel
+
+
+class StubClient:
+    def __init__(self, fail_bulk_cancel=False):
+        self.created = []
+        self.cancelled = []
+        self.bulk_cancels = 0
+        self.fail_bulk_cancel = fail_bulk_cancel
+
+    def format_price(self, price):
+        return f"{price:.8f}"
+
+    def format_quantity(self, qty):
+        return f"{qty:.2f}"
+
+    def create_orders_batch(self, orders):
+        results = []
+        for o in orders:
+            if float(o["price"]) > 1.0:
+                results.append({"error": "price out of range"})
+                continue
+            self.created.append(o)
+            results.append({"id": f"ord-{len(self.created)}"})
+        return results
+
+    def cancel_orders_batch(self, ids):
+        self.cancelled.extend(ids)
+        return [{"id": i} for i in ids]
+
+    def cancel_all_orders(self):
+        self.bulk_cancels += 1
+        if self.fail_bulk_cancel:
+            raise RuntimeError("bulk cancel unavailable")
+        return {}
+
+
+def make_bot(client):
+    cfg = BotConfig()
+    cfg.exchange.ws_url = ""
+    return MarketMaker(cfg, client, RiskManager(cfg.risk))
+
+
+def test_place_orders_tracks_ids_and_skips_failed_elements():
+    client = StubClient()
+    bot = make_bot(client)
+    quotes = [
+        QuoteLevel(side="buy", price=0.5, quantity=10.0, level=0),
+        QuoteLevel(side="sell", price=2.0, quantity=10.0, level=0),
+        QuoteLevel(side="sell", price=0.6, quantity=0.001, level=1),
+    ]
+
+    bot._place_orders(quotes)
+
+    assert list(bot._active_orders) == ["ord-1"]
+    assert bot.risk.open_orders == 1
+    assert len(client.created) == 1
+
+
+def test_cancel_all_uses_bulk_cancel_with_per_id_fallback():
+    client = StubClient()
+    bot = make_bot(client)
+    bot._place_orders([QuoteLevel(side="buy", price=0.5, quantity=10.0, level=0)])
+    bot._cancel_all()
+    assert client.bulk_cancels == 1
+    assert client.cancelled == []
+    assert bot._active_orders == {}
+    assert bot.risk.open_orders == 0
+
+    client = StubClient(fail_bulk_cancel=True)
+    bot = make_bot(client)
+    bot._place_orders([QuoteLevel(side="buy", price=0.5, quantity=10.0, level=0)])
+    bot._cancel_all()
+    assert client.cancelled == ["ord-1"]
+
+
+def test_filled_orders_leave_tracking_and_record_pnl():
+    client = StubClient()
+    client.get_active_orders = lambda symbol=None: [{"id": "ord-2"}]
+    client.get_order = lambda oid: {"status": "FILLED", "side": "buy", "filled": "10", "price": "0.5"}
+    bot = make_bot(client)
+    bot._place_orders([
+        QuoteLevel(side="buy", price=0.5, quantity=10.0, level=0),
+        QuoteLevel(side="buy", price=0.4, quantity=10.0, level=1),
+    ])
+
+    bot._check_and_record_fills()
+
+    assert list(bot._active_orders) == ["ord-2"]
+    assert bot.risk.open_orders == 1
+    assert bot.risk.position.daily_pnl_usdt < 0
+
+
+def test_reprice_keeps_matching_orders_and_replaces_stale_ones():
+    client = StubClient()
+    bot = make_bot(client)
+    bot._place_orders([
+        QuoteLevel(side="buy", price=0.5, quantity=10.0, level=0),
+        QuoteLevel(side="sell", price=0.7, quantity=10.0, level=0),
+    ])
+
+    # Bid moves less than the price/size thresholds: keeps its place
+    bot._reprice_orders([
+        QuoteLevel(side="buy", price=0.5005, quantity=10.2, level=0),
+        QuoteLevel(side="sell", price=0.8, quantity=10.0, level=0),
+    ])
+
+    assert client.cancelled == ["ord-2"]
+    assert client.bulk_cancels == 0
+    assert sorted(bot._active_orders) == ["ord-1", "ord-3"]
+    assert bot._active_orders["ord-3"].quote.price == 0.8
+    assert bot.risk.open_orders == 2
+
+
+def test_cycle_fetches_balances_and_open_orders_on_the_io_pool():
+    import threading
+
+    client = StubClient()
+    callers = {}
+
+    def get_asset_balances(*assets):
+        callers["balances"] = threading.current_thread().name
+        return {a: {"available": "100", "held": "0"} for a in assets}
+
+    def get_active_orders(symbol=None):
+        callers["open"] = threading.current_thread().name
+        return [{"id": "ord-1"}]
+
+    client.get_asset_balances = get_asset_balances
+    client.get_active_orders = get_active_orders
+    client.get_orderbook = lambda limit=5: {"bids": [{"price": "0.5"}], "asks": [{"price": "0.52"}]}
+    bot = make_bot(client)
+    bot._place_orders([QuoteLevel(side="buy", price=0.4, quantity=10.0, level=0)])
+
+    bot._cycle()
+
+    assert callers["balances"].startswith("mm-io")
+    assert callers["open"].startswith("mm-io")
+    assert bot.risk.position.usdt_balance == 100.0
+    bot._io_pool.shutdown()
+
+
+def test_mid_price_uses_stream_until_it_goes_stale():
+    import time
+    from market_maker.ws_client import LocalOrderBook
+
+    class StubStream:
+        book = LocalOrderBook()
+
+    client = StubClient()
+    client.get_orderbook = lambda limit=5: {"bids": [{"price": "0.4"}], "asks": [{"price": "0.42"}]}
+    bot = make_bot(client)
+    bot._ws = StubStream()
+    bot._ws.book.apply_snapshot([["0.5", "10"]], [["0.52", "10"]])
+
+    assert abs(bot._get_mid_price() - 0.51) < 1e-12
+
+    bot._ws.book.updated_at = time.monotonic() - bot.BOOK_MAX_AGE_SEC - 1
+    assert abs(bot._get_mid_price() - 0.41) < 1e-12
+
+
+def test_stream_reports_record_fills_without_rest_polling():
+    from market_maker.ws_client import NonKYCUserStream
+
+    client = StubClient()
+    bot = make_bot(client)
+    bot._place_orders([
+        QuoteLevel(side="buy", price=0.5, quantity=10.0, level=0),
+        QuoteLevel(side="sell", price=0.7, quantity=10.0, level=0),
+    ])
+    stream = NonKYCUserStream("wss://example", "key", "secret")
+    stream._handle_message({"id": 2, "result": True})
+    bot._user_ws, bot._user_session = stream, stream.session
+
+    for report in (
+        {"id": "ord-1", "side": "buy", "status": "partiallyFilled", "reportType": "trade",
+         "tradeQuantity": "4", "tradePrice": "0.5", "tradeFee": "0.004"},
+        {"id": "ord-1", "side": "buy", "status": "filled", "reportType": "trade",
+         "tradeQuantity": "6", "tradePrice": "0.5", "tradeFee": "0.006"},
+        {"id": "ord-2", "side": "sell", "status": "canceled", "reportType": "canceled"},
+    ):
+        stream._handle_message({"method": "report", "params": report})
+
+    bot._check_and_record_fills()   # StubClient has no REST order endpoints
+
+    assert bot._active_orders == {}
+    assert bot.risk.open_orders == 0
+    assert abs(bot.risk.position.daily_pnl_usdt - (-5.01)) < 1e-9
+
+
+def test_stream_resubscription_triggers_one_rest_check_without_double_counting():
+    from market_maker.ws_client import NonKYCUserStream
+
+    client = StubClient()
+    rest_calls = []
+    client.get_active_orders = lambda symbol=None: rest_calls.append(1) or []
+    client.get_order = lambda oid: {"status": "FILLED", "side": "buy", "filled": "10", "price": "0.5"}
+    bot = make_bot(client)
+    bot._place_orders([QuoteLevel(side="buy", price=0.5, quantity=10.0, level=0)])
+    stream = NonKYCUserStream("wss://example", "key", "secret")
+    bot._user_ws = stream
+    stream._handle_message({"method": "report", "params": {
+        "id": "ord-1", "side": "buy", "status": "partiallyFilled",
+        "tradeQuantity": "4", "tradePrice": "0.5", "tradeFee": "0",
+    }})
+    stream._handle_message({"id": 2, "result": True})   # new session
+
+    bot._check_and_record_fills()
+    bot._check_and_record_fills()
+
+    assert len(rest_calls) == 1
+    assert bot._active_orders == {}
+    # 4 from the stream + the remaining 6 from REST, not 4 + 10
+    assert abs(bot.risk.position.daily_pnl_usdt - (-5.0 - 6 * 0.5 * bot._fee_rate)) < 1e-9
+
+
+def test_expired_and_unknown_orders_leave_tracking():
+    client = StubClient()
+    client.get_active_orders = lambda symbol=None: []
+    statuses = {"ord-1": "EXPIRED", "ord-2": "SOMETHING_ELSE", "ord-3": "NEW"}
+
+    def get_order(oid):
+        if oid == "ord-4":
+            raise RuntimeError("lookup failed")
+        return {"status": statuses[oid], "side": "buy", "filled": "0", "price": "0.5"}
+
+    client.get_order = get_order
+    bot = make_bot(client)
+    bot._place_orders([QuoteLevel(side="buy", price=0.5 - 0.01 * i, quantity=10.0, level=i) for i in range(4)])
+
+    bot._check_and_record_fills()
+
+    assert list(bot._active_orders) == ["ord-3"]
+    assert bot.risk.open_orders == 1
+    assert bot.risk.position.daily_pnl_usdt == 0.0
+
+
+def test_failed_cancel_keeps_the_order_tracked():
+    client = StubClient()
+    bot = make_bot(client)
+    bot._place_orders([
+        QuoteLevel(side="buy", price=0.5, quantity=10.0, level=0),
+        QuoteLevel(side="buy", price=0.4, quantity=10.0, level=1),
+    ])
+    client.cancel_orders_batch = lambda ids: [{"id": "ord-1"}, {"error": "exchange busy"}]
+
+    failed = bot._cancel_orders(["ord-1", "ord-2"])
+
+    assert failed == ["ord-2"]
+    assert list(bot._active_orders) == ["ord-2"]
+    assert bot.risk.open_orders == 1
+
+
+def test_reprice_falls_back_to_cancel_all_when_a_cancel_fails():
+    client = StubClient()
+    bot = make_bot(client)
+    bot._place_orders([
+        QuoteLevel(side="buy", price=0.5, quantity=10.0, level=0),
+        QuoteLevel(side="sell", price=0.7, quantity=10.0, level=0),
+    ])
+    client.cancel_orders_batch = lambda ids: [{"error": "exchange busy"} for _ in ids]
+
+    bot._reprice_orders([
+        QuoteLevel(side="buy", price=0.5, quantity=10.0, level=0),
+        QuoteLevel(side="sell", price=0.8, quantity=10.0, level=0),
+    ])
+
+    assert client.bulk_cancels == 1
+    assert sorted(bot._active_orders) == ["ord-3", "ord-4"]
+    assert bot.risk.open_orders == 2
+
+
+def test_book_wakes_are_ignored_while_halted_and_rate_limited():
+    import threading
+    import time
+
+    client = StubClient()
+    client.test_connection = lambda: {"ok": True}
+    client.load_market_metadata = lambda: None
+    bot = make_bot(client)
+    bot._last_quote_mid = 0.5
+
+    bot.risk.halt("test")
+    bot._on_book_update(0.6, 0.62)
+    assert not bot._wake.is_set()
+    bot.risk.resume()
+    bot._on_book_update(0.6, 0.62)
+    assert bot._wake.is_set()
+
+    bot.MIN_WAKE_INTERVAL_SEC = 0.1
+    cycles = []
+
+    def cycle():
+        cycles.append(time.monotonic())
+        bot._wake.set()   # the book flickers continuously
+
+    bot._cycle = cycle
+    threading.Timer(0.35, bot.stop).start()
+    bot.run()
+
+    assert 3 <= len(cycles) <= 5
+    assert all(b - a >= 0.09 for a, b in zip(cycles, cycles[1:]))
+
+
+def test_resting_levels_are_not_charged_against_budget_or_headroom():
+    client = StubClient()
+    cfg = BotConfig()
+    cfg.exchange.ws_url = ""
+    cfg.risk.inventory_skew_factor = 0.0
+    bot = MarketMaker(cfg, client, RiskManager(cfg.risk))
+    mid = 0.00001
+
+    bot.risk.update_balances(1e9, 0.0, 100.0, 0.0, mid_price=mid)
+    bot._reprice_orders(bot._compute_quotes(mid))
+    placed, bulk_cancels = len(client.created), client.bulk_cancels
+    assert placed == 2 * cfg.strategy.num_levels
+
+    # Exchange now holds the bids' USDT: nothing available, no headroom left
+    held = sum(float(o["price"]) * float(o["quantity"]) for o in client.created if o["side"] == "buy")
+    bot.risk.cfg.max_usdt_exposure = held
+    bot.risk.update_balances(1e9, 0.0, 0.0, held, mid_price=mid)
+
+    quotes = bot._compute_quotes(mid)
+    assert sum(q.side == "buy" for q in quotes) == cfg.strategy.num_levels
+    bot._reprice_orders(quotes)
+    assert client.cancelled == [] and client.bulk_cancels == bulk_cancels
+    assert len(client.created) == placed
+
+
+def test_stream_fill_racing_a_cancel_is_still_recorded():
+    from market_maker.ws_client import NonKYCUserStream
+
+    client = StubClient()
+    bot = make_bot(client)
+    stream = NonKYCUserStream("wss://example", "key", "secret")
+    stream._handle_message({"id": 2, "result": True})
+    bot._user_ws, bot._user_session = stream, stream.session
+    bot._place_orders([QuoteLevel(side="buy", price=0.5, quantity=10.0, level=0)])
+
+    bot._cancel_orders(["ord-1"])
+    stream._handle_message({"method": "report", "params": {
+        "id": "ord-1", "side": "buy", "status": "filled", "reportType": "trade",
+        "tradeQuantity": "10", "tradePrice": "0.5", "tradeFee": "0",
+    }})
+    stream._handle_message({"method": "report", "params": {
+        "id": "someone-else", "side": "buy", "status": "filled",
+        "tradeQuantity": "10", "tradePrice": "0.5", "tradeFee": "0",
+    }})
+    bot._check_and_record_fills()
+
+    assert abs(bot.risk.position.daily_pnl_usdt - (-5.0)) < 1e-9
+    assert bot.risk.open_orders == 0
+
+
+def test_stream_client_subclass_must_implement_hooks():
+    import pytest
+    from market_maker.ws_client import _StreamClient
+
+    class NoHandler(_StreamClient):
+        def _on_connect(self, ws):
+            pass
+
+    with pytest.raises(TypeError):
+        NoHandler("wss://example")